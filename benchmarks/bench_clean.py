@@ -0,0 +1,80 @@
+"""
+Benchmark row cleaning: per-cell clean_firestore_data vs columnar
+clean_firestore_records, with and without an inferred schema
+
+Usage:
+    python benchmarks/bench_clean.py --rows 100000 --batch-size 500
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.csv_processor import CSVProcessor
+
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'sample_employees.csv')
+
+
+def load_rows(row_count: int):
+    """
+    Repeat the sample employees rows until row_count rows are available,
+    varying the id, email and salary so those columns stay high-cardinality
+    """
+    with open(SAMPLE_CSV, 'r', encoding='utf-8-sig', newline='') as file:
+        sample = list(csv.DictReader(file))
+    
+    rows = []
+    for i in range(row_count):
+        row = dict(sample[i % len(sample)])
+        row['employee_id'] = f"EMP{i:08d}"
+        row['email'] = f"{i}.{row['email']}"
+        row['salary'] = str(int(row['salary']) + i)
+        rows.append(row)
+    return rows
+
+
+def bench(name: str, clean_batch, rows, batch_size: int) -> float:
+    """Clean rows in batches and print throughput"""
+    # Warm up first: pandas and numpy are imported on first use
+    clean_batch(rows[:batch_size])
+    
+    start = time.perf_counter()
+    for i in range(0, len(rows), batch_size):
+        clean_batch(rows[i:i+batch_size])
+    elapsed = time.perf_counter() - start
+    
+    rows_per_sec = len(rows) / elapsed
+    print(f"{name:<10} {elapsed:8.3f}s  {rows_per_sec:12,.0f} rows/sec")
+    return rows_per_sec
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV row cleaning")
+    parser.add_argument("--rows", type=int, default=100000, help="Number of rows to clean")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per cleaned chunk")
+    args = parser.parse_args()
+    
+    processor = CSVProcessor(None)
+    rows = load_rows(args.rows)
+    columns = len(rows[0])
+    print(f"Cleaning {args.rows:,} rows x {columns} columns in chunks of {args.batch_size}\n")
+    
+    per_cell = bench("per-cell", lambda chunk: [processor.clean_firestore_data(row) for row in chunk],
+                     rows, args.batch_size)
+    columnar = bench("columnar", processor.clean_firestore_records, rows, args.batch_size)
+    
+    schema = processor.infer_schema(SAMPLE_CSV)
+    converters = processor.build_converters(schema)
+    schema_rows = bench("schema", lambda chunk: processor.clean_firestore_records(chunk, converters),
+                        rows, args.batch_size)
+    
+    print(f"\nSpeed-up: columnar {columnar / per_cell:.2f}x, schema {schema_rows / per_cell:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
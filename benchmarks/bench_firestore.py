@@ -0,0 +1,345 @@
+"""
+Benchmark upload, export and delete throughput per engine and batch size
+
+Runs against the Firestore emulator when FIRESTORE_EMULATOR_HOST is set,
+otherwise against the in-process fake client in fake_firestore.py, which
+adds --latency-ms of simulated round trip to every commit and query page.
+Each case runs in a fresh interpreter, and RSS is sampled while each phase
+runs, so a phase reports its own peak rather than the process lifetime peak.
+With the fake client the stored documents live in the same process, so
+export and delete start from the memory the upload left behind; the growth
+column shows how much each phase added on top of that.
+
+Usage:
+    python benchmarks/bench_firestore.py --rows 10000 100000 --batch-sizes 100 500
+    python benchmarks/bench_firestore.py --output results.json --compare baseline.json
+
+Reports rows/s, peak RSS and commit latency percentiles, saves them as JSON
+and, with --compare, exits with status 1 when a case got slower than the
+baseline by more than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Add src and the repository root (sample data generator) to path
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+
+from utils.batch_committer import ENGINES
+
+PHASES = ("upload", "export", "delete")
+
+
+class TimedClient:
+    """Wraps a Firestore client and records how long each commit or flush takes"""
+    
+    def __init__(self, client):
+        self._client = client
+        self.latencies = []
+        self._lock = threading.Lock()
+    
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+    
+    def _timed(self, call):
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.latencies.append(time.perf_counter() - started)
+        return timed
+    
+    def batch(self):
+        batch = self._client.batch()
+        batch.commit = self._timed(batch.commit)
+        return batch
+    
+    def bulk_writer(self, options=None):
+        bulk_writer = self._client.bulk_writer(options)
+        bulk_writer.flush = self._timed(bulk_writer.flush)
+        return bulk_writer
+    
+    def take_latencies(self):
+        """Return and reset the latencies recorded so far"""
+        with self._lock:
+            latencies, self.latencies = self.latencies, []
+        return latencies
+
+
+def percentile(values, fraction: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    index = min(len(values) - 1, max(0, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+def latency_summary(latencies):
+    """Commit latency percentiles in milliseconds"""
+    if not latencies:
+        return None
+    values = sorted(latency * 1000 for latency in latencies)
+    return {
+        'count': len(values),
+        'p50': round(percentile(values, 0.50), 2),
+        'p90': round(percentile(values, 0.90), 2),
+        'p99': round(percentile(values, 0.99), 2),
+        'max': round(values[-1], 2),
+    }
+
+
+def current_rss_mb():
+    """Resident set size of this process right now, or None where unsupported"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm", 'r') as file:
+            pages = int(file.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class RssSampler:
+    """Samples RSS on a background thread and keeps the peak seen since start"""
+    
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.start_mb = None
+        self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def _sample(self):
+        rss = current_rss_mb()
+        if rss is not None:
+            self.peak_mb = rss if self.peak_mb is None else max(self.peak_mb, rss)
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+    
+    def __enter__(self):
+        self.start_mb = current_rss_mb()
+        self.peak_mb = self.start_mb
+        if self.start_mb is not None:
+            self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+            self._thread.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._sample()
+        return False
+    
+    def summary(self):
+        """Peak RSS of the phase and how far it rose above the starting RSS, in MB"""
+        if self.peak_mb is None:
+            return None, None
+        return round(self.peak_mb, 1), round(self.peak_mb - self.start_mb, 1)
+
+
+def create_client(backend: str, latency: float):
+    """Create the emulator client or the in-process fake"""
+    if backend == "emulator":
+        from google.cloud import firestore
+        return firestore.Client(project=os.environ.get("GCLOUD_PROJECT", "firecsv-bench"))
+    
+    from fake_firestore import FakeClient
+    return FakeClient(latency=latency)
+
+
+def sample_csv(data_dir: str, rows: int) -> str:
+    """Path of a sample employees CSV with `rows` rows, generated once per size"""
+    from create_sample_employees_en import create_sample_csv
+    
+    path = os.path.join(data_dir, f"employees_{rows}.csv")
+    if not os.path.exists(path):
+        create_sample_csv(rows, path, seed=rows, verbose=False)
+    return path
+
+
+def run_case(case) -> dict:
+    """Upload, export and delete one collection, measuring each phase"""
+    from firebase.collection_manager import CollectionManager
+    from utils.csv_processor import CSVProcessor
+    
+    db = TimedClient(create_client(case['backend'], case['latency_ms'] / 1000))
+    collection = f"bench_{case['engine']}_{case['batch_size']}_{int(time.time() * 1000)}"
+    csv_processor = CSVProcessor(db)
+    collection_manager = CollectionManager(db)
+    result = {key: case[key] for key in ('rows', 'engine', 'batch_size', 'concurrency')}
+    
+    def measure(phase: str, run):
+        with RssSampler() as sampler:
+            started = time.perf_counter()
+            success = run()
+            seconds = time.perf_counter() - started
+        peak_rss, rss_growth = sampler.summary()
+        result[phase] = {
+            'success': success,
+            'seconds': round(seconds, 3),
+            'rows_per_second': round(case['rows'] / seconds, 1) if seconds > 0 else None,
+            'commit_latency_ms': latency_summary(db.take_latencies()),
+            'peak_rss_mb': peak_rss,
+            'rss_growth_mb': rss_growth,
+        }
+    
+    measure('upload', lambda: csv_processor.upload_csv(
+        case['csv'], collection,
+        batch_size=case['batch_size'],
+        max_in_flight=case['concurrency'],
+        engine=case['engine']
+    ))
+    
+    with tempfile.TemporaryDirectory() as export_dir:
+        measure('export', lambda: collection_manager.export_collection(
+            collection, os.path.join(export_dir, "export.csv"), page_size=case['page_size']
+        ))
+    
+    measure('delete', lambda: collection_manager.delete_collection(
+        collection,
+        engine=case['engine'],
+        max_in_flight=case['concurrency'],
+        batch_size=case['batch_size']
+    ))
+    
+    return result
+
+
+def run_case_process(case) -> dict:
+    """Run one case in a fresh interpreter"""
+    command = [sys.executable, os.path.abspath(__file__), "--case", json.dumps(case)]
+    output = subprocess.run(command, capture_output=True, text=True, cwd=ROOT)
+    if output.returncode != 0:
+        raise RuntimeError(output.stderr.strip().splitlines()[-1] if output.stderr.strip() else
+                           f"case exited with status {output.returncode}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def case_key(result: dict, phase: str) -> str:
+    return f"{phase} {result['engine']} batch={result['batch_size']} rows={result['rows']}"
+
+
+def print_result(result: dict):
+    for phase in PHASES:
+        stats = result[phase]
+        latency = stats['commit_latency_ms']
+        latency_text = (f"p50 {latency['p50']:7.1f}  p90 {latency['p90']:7.1f}  p99 {latency['p99']:7.1f} ms"
+                        if latency else "")
+        status = "" if stats['success'] else "  FAILED"
+        rss = (f"{stats['peak_rss_mb']:7.1f} MB ({stats['rss_growth_mb']:+.1f})"
+               if stats['peak_rss_mb'] is not None else "      n/a")
+        print(f"{case_key(result, phase):<40} {stats['rows_per_second'] or 0:10,.0f} rows/s  "
+              f"rss {rss}  {latency_text}{status}")
+
+
+def compare(results, baseline_file: str, threshold: float) -> bool:
+    """
+    Print the rows/s change against a baseline results file
+    
+    Returns:
+        False when any case is slower than the baseline by more than threshold
+    """
+    with open(baseline_file, 'r', encoding='utf-8') as file:
+        baseline = {case_key(result, phase): result[phase]['rows_per_second']
+                    for result in json.load(file)['results'] for phase in PHASES}
+    
+    print(f"\nCompared with {baseline_file}")
+    passed = True
+    for result in results:
+        for phase in PHASES:
+            key = case_key(result, phase)
+            before, after = baseline.get(key), result[phase]['rows_per_second']
+            if not before or not after:
+                continue
+            
+            change = after / before - 1
+            regressed = change < -threshold
+            passed = passed and not regressed
+            print(f"{key:<40} {change:+7.1%}{'  REGRESSION' if regressed else ''}")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark upload, export and delete throughput")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000], help="Row counts to benchmark")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent batches")
+    parser.add_argument("--page-size", type=int, default=1000, help="Export page size")
+    parser.add_argument("--backend", choices=["auto", "emulator", "fake"], default="auto",
+                        help="auto uses the emulator when FIRESTORE_EMULATOR_HOST is set")
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="Simulated round trip of the fake client")
+    parser.add_argument("--data-dir", help="Where generated CSV files are kept (default: temporary)")
+    parser.add_argument("--output", default="bench_results.json", help="Results JSON file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Allowed rows/s drop against the baseline (0.1 = 10%%)")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.case:
+        print(json.dumps(run_case(json.loads(args.case))))
+        return
+    
+    backend = args.backend
+    if backend == "auto":
+        backend = "emulator" if os.environ.get("FIRESTORE_EMULATOR_HOST") else "fake"
+    if backend == "emulator" and not os.environ.get("FIRESTORE_EMULATOR_HOST"):
+        parser.error("FIRESTORE_EMULATOR_HOST must be set to use the emulator")
+    
+    print(f"Backend: {backend}" + (f" ({args.latency_ms:g} ms simulated latency)" if backend == "fake" else ""))
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = args.data_dir or temp_dir
+        os.makedirs(data_dir, exist_ok=True)
+        
+        results = []
+        for rows in args.rows:
+            csv_path = sample_csv(data_dir, rows)
+            for engine in args.engines:
+                for batch_size in args.batch_sizes:
+                    result = run_case_process({
+                        'backend': backend, 'latency_ms': args.latency_ms, 'csv': csv_path,
+                        'rows': rows, 'engine': engine, 'batch_size': batch_size,
+                        'concurrency': args.concurrency, 'page_size': args.page_size,
+                    })
+                    print_result(result)
+                    results.append(result)
+    
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'backend': backend,
+                'latency_ms': args.latency_ms if backend == "fake" else None,
+            },
+            'results': results,
+        }, file, indent=2)
+    print(f"\nResults saved to {args.output}")
+    
+    if args.compare and not compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark startup latency: time to the first GUI window and CLI --help,
+each measured in a fresh interpreter, and check that no heavy module
+(Firebase SDK, grpc, pandas, numpy) is imported before it is needed
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --max-window 1.0 --max-help 0.5
+
+Exits with status 1 when a limit is exceeded or a heavy module is loaded
+at startup, so it can guard against regressions in CI.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Modules that must not be imported until a connection or upload needs them
+HEAVY_MODULES = ("firebase_admin", "google.cloud.firestore", "grpc", "pandas", "numpy")
+
+# Builds the main window, shows it once, and reports the heavy modules loaded
+FIRST_WINDOW = """
+import json, sys, tkinter as tk
+sys.path.insert(0, {root!r})
+from main import FireCSVUploader
+root = tk.Tk()
+app = FireCSVUploader(root)
+root.update()
+root.destroy()
+print(json.dumps([module for module in {heavy!r} if module in sys.modules]))
+"""
+
+CLI_HELP = """
+import json, sys, contextlib, io
+sys.path.insert(0, {root!r})
+import firecsv
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        firecsv.main(["--help"])
+    except SystemExit:
+        pass
+print(json.dumps([module for module in {heavy!r} if module in sys.modules]))
+"""
+
+
+def missing_display(stderr: str) -> bool:
+    """Whether a script failed only because Tk found no display to open"""
+    return "TclError" in stderr and "display" in stderr.lower()
+
+
+def time_script(script: str, runs: int):
+    """
+    Run a script in fresh interpreters
+    
+    Returns:
+        Tuple of (list of wall times in seconds, heavy modules loaded, None),
+        or (None, error message, whether the failure is a missing display)
+        when the script fails
+    """
+    code = script.format(root=ROOT, heavy=HEAVY_MODULES)
+    timings = []
+    loaded = []
+    
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT)
+        timings.append(time.perf_counter() - started)
+        
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines() or [f"exit status {result.returncode}"]
+            return None, lines[-1], missing_display(result.stderr)
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    
+    return timings, loaded, None
+
+
+def report(name: str, timings, loaded, no_display, limit) -> bool:
+    """Print one benchmark line and return whether it passed"""
+    if timings is None:
+        if no_display:
+            print(f"{name:<14} skipped ({loaded})")
+            return True
+        print(f"{name:<14} failed ({loaded})")
+        return False
+    
+    median = statistics.median(timings)
+    print(f"{name:<14} median {median * 1000:7.1f} ms   min {min(timings) * 1000:7.1f} ms   "
+          f"heavy modules: {', '.join(loaded) or 'none'}")
+    
+    passed = not loaded
+    if limit is not None and median > limit:
+        print(f"  exceeds limit of {limit * 1000:.0f} ms")
+        passed = False
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GUI and CLI startup latency")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-window", type=float, help="Fail if the first window takes longer (seconds)")
+    parser.add_argument("--max-help", type=float, help="Fail if CLI --help takes longer (seconds)")
+    args = parser.parse_args()
+    
+    print(f"Startup latency over {args.runs} runs")
+    
+    # The first window needs a display; it is skipped on headless machines
+    window_ok = report("First window", *time_script(FIRST_WINDOW, args.runs), args.max_window)
+    help_ok = report("CLI --help", *time_script(CLI_HELP, args.runs), args.max_help)
+    
+    sys.exit(0 if window_ok and help_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+"""
+In-process stand-in for the Firestore client used by the benchmarks
+
+Implements the subset of google.cloud.firestore.Client that the uploader,
+exporter and delete code paths use: collection/document references, write
+batches, a BulkWriter, cursor queries (order_by, limit, start_after,
+start_at, end_before, select), list_documents, collections, count() and
+collection group partition queries.
+Every commit sleeps for a configurable round-trip latency so concurrency
+settings behave roughly as they would against a real backend.
+"""
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+
+class _Collection:
+    """Documents of one collection, with a lazily sorted ID index"""
+    
+    def __init__(self):
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self._sorted: List[str] = []
+        self._dirty = False
+    
+    def set(self, doc_id: str, data: Dict[str, Any]):
+        if doc_id not in self.docs:
+            self._dirty = True
+        self.docs[doc_id] = data
+    
+    def delete(self, doc_id: str):
+        # Deleted IDs stay in the sorted index and are skipped by queries,
+        # so paging through a collection while deleting it stays cheap
+        self.docs.pop(doc_id, None)
+    
+    def ids(self) -> List[str]:
+        if self._dirty:
+            self._sorted = sorted(self.docs)
+            self._dirty = False
+        return self._sorted
+
+
+class FakeSnapshot:
+    def __init__(self, reference: "FakeDocument", data: Optional[Dict[str, Any]]):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+    
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocument:
+    def __init__(self, client: "FakeClient", path: str):
+        self._client = client
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+        self.parent = FakeCollectionRef(client, path.rsplit("/", 1)[0])
+    
+    def collection(self, collection_id: str) -> "FakeCollectionRef":
+        return FakeCollectionRef(self._client, f"{self.path}/{collection_id}")
+    
+    def collections(self) -> List["FakeCollectionRef"]:
+        return self._client._child_collections(self.path)
+    
+    def get(self) -> FakeSnapshot:
+        return FakeSnapshot(self, self._client._get(self.path))
+
+
+class FakeQuery:
+    def __init__(self, client: "FakeClient", path: str):
+        self._client = client
+        self._path = path
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._start: Optional[str] = None
+        self._start_inclusive = False
+        self._end: Optional[str] = None
+        self._keys_only = False
+    
+    def _copy(self, **changes) -> "FakeQuery":
+        query = FakeQuery(self._client, self._path)
+        query.__dict__.update(self.__dict__)
+        query.__dict__.update(changes)
+        return query
+    
+    def order_by(self, field: str) -> "FakeQuery":
+        # Only document-ID order is supported, which is the default
+        return self
+    
+    def select(self, field_paths) -> "FakeQuery":
+        return self._copy(_keys_only=True)
+    
+    def limit(self, count: int) -> "FakeQuery":
+        return self._copy(_limit=count)
+    
+    def offset(self, count: int) -> "FakeQuery":
+        return self._copy(_offset=count)
+    
+    def start_after(self, cursor: Dict[str, str]) -> "FakeQuery":
+        return self._copy(_start=cursor["__name__"], _start_inclusive=False)
+    
+    def start_at(self, cursor: Dict[str, str]) -> "FakeQuery":
+        return self._copy(_start=cursor["__name__"], _start_inclusive=True)
+    
+    def end_before(self, cursor: Dict[str, str]) -> "FakeQuery":
+        return self._copy(_end=cursor["__name__"])
+    
+    def stream(self):
+        self._client._round_trip()
+        return iter(self._client._query(self))
+    
+    def count(self, alias: Optional[str] = None) -> "_CountQuery":
+        return _CountQuery(self)
+
+
+class FakeCollectionRef(FakeQuery):
+    def __init__(self, client: "FakeClient", path: str):
+        # Like the SDK, collection references expose no `path` attribute
+        super().__init__(client, path)
+        self.id = path.rsplit("/", 1)[-1]
+    
+    def document(self, document_id: Optional[str] = None) -> FakeDocument:
+        return FakeDocument(self._client, f"{self._path}/{document_id or uuid.uuid4().hex[:20]}")
+    
+    def list_documents(self, page_size: Optional[int] = None):
+        self._client._round_trip()
+        return iter([FakeDocument(self._client, f"{self._path}/{doc_id}")
+                     for doc_id in self._client._list_ids(self._path)])
+
+
+class FakeQueryPartition:
+    def __init__(self, start_at: Optional[FakeDocument], end_at: Optional[FakeDocument]):
+        self.start_at = start_at
+        self.end_at = end_at
+
+
+class FakeCollectionGroup:
+    def __init__(self, client: "FakeClient", collection_id: str):
+        self._client = client
+        self._collection_id = collection_id
+    
+    def get_partitions(self, partition_count: int):
+        """
+        Yield up to `partition_count` partitions of every collection with
+        this ID, split evenly in document path order like the SDK's cursors
+        """
+        self._client._round_trip()
+        paths = self._client._group_paths(self._collection_id)
+        step = -(-len(paths) // partition_count) if paths else 0
+        start_at = None
+        for index in range(step, len(paths), step or 1):
+            cursor = FakeDocument(self._client, paths[index])
+            yield FakeQueryPartition(start_at, cursor)
+            start_at = cursor
+        yield FakeQueryPartition(start_at, None)
+
+
+class _AggregationResult:
+    def __init__(self, value: int):
+        self.value = value
+
+
+class _CountQuery:
+    def __init__(self, query: FakeQuery):
+        self._query = query
+    
+    def get(self):
+        self._query._client._round_trip()
+        return [[_AggregationResult(len(self._query._client._query(self._query.limit(None))))]]
+
+
+class FakeWriteBatch:
+    def __init__(self, client: "FakeClient"):
+        self._client = client
+        self._writes = []
+    
+    def set(self, reference: FakeDocument, data: Dict[str, Any], merge: bool = False):
+        self._writes.append((reference.path, data))
+    
+    def delete(self, reference: FakeDocument):
+        self._writes.append((reference.path, None))
+    
+    def commit(self):
+        self._client._commit(self._writes)
+    
+    def __len__(self):
+        return len(self._writes)
+
+
+class FakeBulkWriter:
+    """
+    Queues writes and commits them as 20-write batches on a small pool,
+    like the SDK BulkWriter. Rate ramping and retries are not simulated.
+    """
+    
+    BATCH_SIZE = 20
+    
+    def __init__(self, client: "FakeClient", max_workers: int = 10):
+        self._client = client
+        self._writes = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fake-bulk")
+    
+    def on_write_error(self, callback):
+        pass
+    
+    def set(self, reference: FakeDocument, data: Dict[str, Any], merge: bool = False):
+        self._writes.append((reference.path, data))
+    
+    def delete(self, reference: FakeDocument):
+        self._writes.append((reference.path, None))
+    
+    def flush(self):
+        writes, self._writes = self._writes, []
+        batches = [writes[i:i + self.BATCH_SIZE] for i in range(0, len(writes), self.BATCH_SIZE)]
+        for future in [self._executor.submit(self._client._commit, batch) for batch in batches]:
+            future.result()
+    
+    def close(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+
+class FakeClient:
+    """
+    Thread-safe in-memory Firestore client
+    
+    Args:
+        latency: Seconds each commit, query page and count() takes
+        project: Project ID reported by the client
+    """
+    
+    def __init__(self, latency: float = 0.0, project: str = "fake-project"):
+        self.latency = latency
+        self.project = project
+        self._collections: Dict[str, _Collection] = {}
+        self._lock = threading.Lock()
+    
+    def collection(self, *path: str) -> FakeCollectionRef:
+        return FakeCollectionRef(self, "/".join(path))
+    
+    def document(self, *path: str) -> FakeDocument:
+        return FakeDocument(self, "/".join(path))
+    
+    def collections(self) -> List[FakeCollectionRef]:
+        with self._lock:
+            return [FakeCollectionRef(self, path) for path in sorted(self._collections)
+                    if "/" not in path and self._collections[path].docs]
+    
+    def collection_group(self, collection_id: str) -> FakeCollectionGroup:
+        return FakeCollectionGroup(self, collection_id)
+    
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+    
+    def bulk_writer(self, options: Any = None) -> FakeBulkWriter:
+        return FakeBulkWriter(self)
+    
+    def document_count(self) -> int:
+        """Number of documents across all collections"""
+        with self._lock:
+            return sum(len(collection.docs) for collection in self._collections.values())
+    
+    def _round_trip(self):
+        if self.latency:
+            time.sleep(self.latency)
+    
+    def _commit(self, writes):
+        self._round_trip()
+        with self._lock:
+            for path, data in writes:
+                collection_path, doc_id = path.rsplit("/", 1)
+                if data is None:
+                    if collection_path in self._collections:
+                        self._collections[collection_path].delete(doc_id)
+                else:
+                    self._collections.setdefault(collection_path, _Collection()).set(doc_id, dict(data))
+    
+    def _get(self, path: str) -> Optional[Dict[str, Any]]:
+        collection_path, doc_id = path.rsplit("/", 1)
+        with self._lock:
+            collection = self._collections.get(collection_path)
+            return collection.docs.get(doc_id) if collection else None
+    
+    def _query(self, query: FakeQuery) -> List[FakeSnapshot]:
+        with self._lock:
+            collection = self._collections.get(query._path)
+            if collection is None:
+                return []
+            
+            ids = collection.ids()
+            start = 0
+            if query._start is not None:
+                bisect = bisect_left if query._start_inclusive else bisect_right
+                start = bisect(ids, query._start)
+            end = bisect_left(ids, query._end) if query._end is not None else len(ids)
+            
+            snapshots = []
+            skip = query._offset
+            for doc_id in _islice_ids(ids, start, end):
+                data = collection.docs.get(doc_id)
+                if data is None:
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                reference = FakeDocument(self, f"{query._path}/{doc_id}")
+                snapshots.append(FakeSnapshot(reference, {} if query._keys_only else data))
+                if query._limit is not None and len(snapshots) >= query._limit:
+                    break
+            return snapshots
+    
+    def _group_paths(self, collection_id: str) -> List[str]:
+        """Sorted document paths across all collections with this ID"""
+        with self._lock:
+            return sorted(f"{path}/{doc_id}"
+                          for path, collection in self._collections.items()
+                          if path.rsplit("/", 1)[-1] == collection_id
+                          for doc_id in collection.docs)
+    
+    def _list_ids(self, collection_path: str) -> List[str]:
+        """Document IDs of a collection, including missing parents of sub-collections"""
+        prefix = collection_path + "/"
+        with self._lock:
+            ids = set(self._collections[collection_path].docs) if collection_path in self._collections else set()
+            for path, collection in self._collections.items():
+                if path.startswith(prefix) and collection.docs:
+                    ids.add(path[len(prefix):].split("/", 1)[0])
+        return sorted(ids)
+    
+    def _child_collections(self, document_path: str) -> List[FakeCollectionRef]:
+        prefix = document_path + "/"
+        with self._lock:
+            names = {path[len(prefix):].split("/", 1)[0]
+                     for path, collection in self._collections.items()
+                     if path.startswith(prefix) and collection.docs}
+        return [FakeCollectionRef(self, prefix + name) for name in sorted(names)]
+
+
+def _islice_ids(ids: List[str], start: int, end: int):
+    """Iterate ids[start:end] without copying the slice"""
+    for index in range(start, end):
+        yield ids[index]
@@ -0,0 +1,328 @@
+"""
+Synthetic CSV generator for load testing
+
+Columns are generated with numpy one chunk at a time and formatted straight
+into bytes with integer arithmetic, so tens of millions of rows are written
+without a Python step per value and with bounded memory. Several
+files are written in parallel processes, and every chunk is seeded from
+(seed, file, chunk), so the same arguments always produce the same files.
+
+Usage:
+    python create_load_test_csv.py --rows 10000000 --output load_test.csv
+    python create_load_test_csv.py --rows 1000000 --files 8 --columns 30 --null-ratio 0.05
+    python create_load_test_csv.py --rows 1000000 --schema load_schema.json
+
+A schema file lists the columns to generate:
+    {"columns": [
+        {"name": "id", "type": "key"},
+        {"name": "city", "type": "string", "width": [4, 12], "cardinality": 200},
+        {"name": "score", "type": "float", "null_ratio": 0.1}
+    ]}
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Generated column types; "key" is the document key column
+COLUMN_TYPES = ("key", "int", "float", "bool", "string", "date", "timestamp")
+
+# Types cycled through by --columns after the leading key column
+DEFAULT_TYPES = ("string", "int", "float", "bool", "date", "timestamp")
+
+_LETTERS = np.frombuffer(b"abcdefghijklmnopqrstuvwxyz", dtype=np.uint8)
+_BOOLS = np.frombuffer(b"False" b"True\0", dtype=np.uint8).reshape(2, 5)
+_EPOCH = np.datetime64("2020-01-01T00:00:00", "s")
+_DATE_SPAN_DAYS = 5 * 365
+
+
+def default_schema(column_count: int, null_ratio: float = 0.0, string_width: Tuple[int, int] = (8, 24),
+                   key_cardinality: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Build a schema of a key column followed by columns of every type
+    
+    Args:
+        column_count: Total number of columns, including the key column
+        null_ratio: Fraction of empty values in the non-key columns
+        string_width: Minimum and maximum length of string values
+        key_cardinality: Distinct key values (default: every row unique)
+    
+    Returns:
+        List of column specifications
+    """
+    columns = [{"name": "id", "type": "key", "cardinality": key_cardinality}]
+    for index in range(1, column_count):
+        column_type = DEFAULT_TYPES[(index - 1) % len(DEFAULT_TYPES)]
+        columns.append({"name": f"{column_type}_{index}", "type": column_type,
+                        "null_ratio": null_ratio, "width": list(string_width)})
+    return columns
+
+
+def load_schema(schema_path: str) -> List[Dict[str, Any]]:
+    """
+    Load column specifications from a JSON or YAML schema file
+    
+    Each column has a name and a type (one of COLUMN_TYPES) and optionally
+    null_ratio, width ([min, max] string length) and cardinality (number
+    of distinct values for key, int and string columns).
+    """
+    with open(schema_path, 'r', encoding='utf-8') as file:
+        if schema_path.lower().endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("PyYAML is required for YAML schema files (pip install pyyaml)")
+            schema = yaml.safe_load(file)
+        else:
+            schema = json.load(file)
+    
+    columns = schema.get("columns") if isinstance(schema, dict) else schema
+    if not isinstance(columns, list) or not columns:
+        raise ValueError(f"Schema file must list the columns to generate: {schema_path}")
+    
+    for column in columns:
+        if not isinstance(column, dict) or "name" not in column:
+            raise ValueError(f"Every column needs a name: {column}")
+        if column.get("type", "string") not in COLUMN_TYPES:
+            raise ValueError(f"Unknown type '{column['type']}' for column '{column['name']}' "
+                             f"(expected one of {', '.join(COLUMN_TYPES)})")
+    return columns
+
+
+def _random_strings(rng: np.random.Generator, count: int, width: Tuple[int, int]) -> np.ndarray:
+    """Random lowercase strings with lengths uniform in width, as NUL-padded byte rows"""
+    min_width, max_width = width
+    letters = _LETTERS[rng.integers(0, len(_LETTERS), size=(count, max_width))]
+    lengths = rng.integers(min_width, max_width + 1, size=count)
+    letters[np.arange(max_width) >= lengths[:, None]] = 0
+    return letters
+
+
+def _digits(values: np.ndarray, width: Optional[int] = None) -> np.ndarray:
+    """
+    Decimal digits of non-negative integers as byte rows
+    
+    With a width the digits are zero-padded to it (months, seconds, ...);
+    without one, leading zeros become NUL padding, which is dropped.
+    """
+    padded = width is not None
+    if not padded:
+        width = len(str(int(values.max()))) if len(values) else 1
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    digits = ((values[:, None] // powers) % 10 + ord("0")).astype(np.uint8)
+    if not padded:
+        digits[(values[:, None] < powers) & (powers > 1)] = 0
+    return digits
+
+
+def _char(count: int, char: str) -> np.ndarray:
+    """A column of one literal character, as byte rows"""
+    return np.full((count, 1), ord(char), dtype=np.uint8)
+
+
+def _date_parts(dates: np.ndarray) -> List[np.ndarray]:
+    """YYYY-MM-DD byte rows of datetime64[D] values"""
+    count = len(dates)
+    years = dates.astype("datetime64[Y]")
+    months = dates.astype("datetime64[M]")
+    return [_digits(years.astype(np.int64) + 1970, 4), _char(count, "-"),
+            _digits((months - years.astype("datetime64[M]")).astype(np.int64) + 1, 2), _char(count, "-"),
+            _digits((dates - months.astype("datetime64[D]")).astype(np.int64) + 1, 2)]
+
+
+def _vocabularies(columns: List[Dict[str, Any]], seed: int) -> Dict[int, np.ndarray]:
+    """Fixed value sets for string columns with a cardinality, shared by all files"""
+    vocabularies = {}
+    for index, column in enumerate(columns):
+        if column.get("type", "string") == "string" and column.get("cardinality"):
+            rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0, index)))
+            vocabularies[index] = _random_strings(rng, int(column["cardinality"]),
+                                                  tuple(column.get("width", (8, 24))))
+    return vocabularies
+
+
+def generate_column(column: Dict[str, Any], rng: np.random.Generator, count: int, row_offset: int,
+                    vocabulary: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Generate the CSV values of one column for a chunk of rows
+    
+    Values are formatted with integer arithmetic straight into bytes, one
+    row per value, NUL-padded to a common width. They only hold letters,
+    digits and ".-:T", so they never need CSV quoting.
+    
+    Args:
+        column: Column specification
+        rng: Random generator of the chunk
+        count: Number of rows
+        row_offset: Index of the chunk's first row across all files
+        vocabulary: Value set of a string column with a cardinality
+    
+    Returns:
+        uint8 array of shape (count, width), all NUL where the value is null
+    """
+    column_type = column.get("type", "string")
+    cardinality = column.get("cardinality")
+    
+    if column_type == "key":
+        if cardinality:
+            values = rng.integers(0, int(cardinality), size=count)
+        else:
+            values = np.arange(row_offset, row_offset + count)
+        return _digits(values)
+    
+    if column_type == "int":
+        if cardinality:
+            values = rng.integers(0, int(cardinality), size=count)
+        else:
+            values = rng.integers(0, 1_000_000, size=count)
+        text = _digits(values)
+    elif column_type == "float":
+        cents = np.rint(rng.random(count) * 10_000_000).astype(np.int64)
+        text = np.concatenate([_digits(cents // 100), _char(count, "."), _digits(cents % 100, 2)], axis=1)
+    elif column_type == "bool":
+        text = _BOOLS[(rng.random(count) < 0.5).astype(np.intp)]
+    elif column_type == "date":
+        days = rng.integers(0, _DATE_SPAN_DAYS, size=count).astype("timedelta64[D]")
+        text = np.concatenate(_date_parts(_EPOCH.astype("datetime64[D]") + days), axis=1)
+    elif column_type == "timestamp":
+        seconds = rng.integers(0, _DATE_SPAN_DAYS * 86400, size=count)
+        times = seconds % 86400
+        dates = _EPOCH.astype("datetime64[D]") + (seconds // 86400).astype("timedelta64[D]")
+        text = np.concatenate(_date_parts(dates) + [
+            _char(count, "T"), _digits(times // 3600, 2), _char(count, ":"),
+            _digits(times // 60 % 60, 2), _char(count, ":"), _digits(times % 60, 2)
+        ], axis=1)
+    elif vocabulary is not None:
+        text = vocabulary[rng.integers(0, len(vocabulary), size=count)]
+    else:
+        text = _random_strings(rng, count, tuple(column.get("width", (8, 24))))
+    
+    null_ratio = column.get("null_ratio", 0.0)
+    if null_ratio:
+        text[rng.random(count) < null_ratio] = 0
+    return text
+
+
+def generate_chunk(columns: List[Dict[str, Any]], vocabularies: Dict[int, np.ndarray], seed: int,
+                   file_index: int, chunk_index: int, count: int, row_offset: int) -> bytes:
+    """
+    Generate one chunk of CSV lines, seeded from (seed, file, chunk)
+    
+    The columns are laid out side by side as one byte matrix with a
+    separator after each; dropping the NUL padding leaves the CSV lines.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(1, file_index, chunk_index)))
+    separator = _char(count, ",")
+    
+    blocks = []
+    for index, column in enumerate(columns):
+        blocks.append(generate_column(column, rng, count, row_offset, vocabularies.get(index)))
+        blocks.append(separator)
+    
+    matrix = np.concatenate(blocks, axis=1)
+    matrix[:, -1] = ord("\n")
+    chunk = matrix[matrix != 0].tobytes()
+    
+    # Data rows are not quoted, so no value may hold a delimiter or a quote
+    if chunk.count(b",") != count * (len(columns) - 1) or chunk.count(b"\n") != count \
+            or b'"' in chunk or b"\r" in chunk:
+        raise ValueError("Generated values contain CSV delimiters, quotes or newlines")
+    return chunk
+
+
+def shard_path(output_file: str, file_index: int, file_count: int) -> str:
+    """Output path of one file (name-00000-of-00004.csv when writing several)"""
+    if file_count == 1:
+        return output_file
+    root, ext = os.path.splitext(output_file)
+    return f"{root}-{file_index:05d}-of-{file_count:05d}{ext or '.csv'}"
+
+
+def write_file(columns: List[Dict[str, Any]], output_file: str, rows: int, seed: int,
+               file_index: int = 0, file_count: int = 1, chunk_rows: int = 100_000) -> Tuple[str, int]:
+    """
+    Write one CSV file chunk by chunk
+    
+    Keys of unique key columns continue across files, so several files
+    together behave like one large table.
+    
+    Returns:
+        Tuple of (file path, bytes written)
+    """
+    path = shard_path(output_file, file_index, file_count)
+    vocabularies = _vocabularies(columns, seed)
+    
+    with open(path, 'wb') as file:
+        header = io.StringIO()
+        csv.writer(header, lineterminator="\n").writerow(column["name"] for column in columns)
+        file.write(header.getvalue().encode('utf-8'))
+        
+        for chunk_index, start in enumerate(range(0, rows, chunk_rows)):
+            count = min(chunk_rows, rows - start)
+            chunk = generate_chunk(columns, vocabularies, seed, file_index, chunk_index,
+                                   count, file_index * rows + start)
+            file.write(chunk)
+        
+        return path, file.tell()
+
+
+def parse_width(value: str) -> Tuple[int, int]:
+    """Parse a string width given as N or MIN:MAX"""
+    min_width, _, max_width = value.partition(":")
+    width = (int(min_width), int(max_width or min_width))
+    if not 0 <= width[0] <= width[1] or width[1] == 0:
+        raise argparse.ArgumentTypeError(f"Invalid string width: {value}")
+    return width
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate large synthetic CSV files for load testing")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows per file")
+    parser.add_argument("--output", default="load_test.csv", help="Output CSV file")
+    parser.add_argument("--files", type=int, default=1, help="Number of files (name-00000-of-0000N.csv)")
+    parser.add_argument("--processes", type=int, help="Files written at the same time (default: CPU count)")
+    parser.add_argument("--schema", help="JSON/YAML file listing the columns to generate")
+    parser.add_argument("--columns", type=int, default=10, help="Number of columns without --schema")
+    parser.add_argument("--null-ratio", type=float, default=0.0, help="Fraction of empty values")
+    parser.add_argument("--string-width", type=parse_width, default=(8, 24), help="String length, N or MIN:MAX")
+    parser.add_argument("--key-cardinality", type=int, help="Distinct values of the id column (default: unique)")
+    parser.add_argument("--chunk-rows", type=int, default=100_000, help="Rows generated at a time")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    if args.schema:
+        columns = load_schema(args.schema)
+    else:
+        columns = default_schema(max(1, args.columns), args.null_ratio, args.string_width, args.key_cardinality)
+    
+    started = time.perf_counter()
+    processes = min(args.files, args.processes or os.cpu_count() or 1)
+    
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(write_file, columns, args.output, args.rows, args.seed,
+                                       index, args.files, args.chunk_rows)
+                       for index in range(args.files)]
+            written = [future.result() for future in futures]
+    else:
+        written = [write_file(columns, args.output, args.rows, args.seed, index, args.files, args.chunk_rows)
+                   for index in range(args.files)]
+    
+    elapsed = time.perf_counter() - started
+    total_rows = args.rows * args.files
+    total_bytes = sum(size for _, size in written)
+    
+    for path, size in written:
+        print(f"📄 {path} ({size / 1024 / 1024:,.1f} MB)")
+    print(f"✅ {total_rows:,} rows x {len(columns)} columns in {elapsed:.1f}s "
+          f"({total_rows / elapsed:,.0f} rows/s, {total_bytes / 1024 / 1024 / elapsed:,.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
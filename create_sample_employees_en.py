@@ -1,9 +1,21 @@
+import argparse
 import csv
 import random
 from datetime import datetime, timedelta
 
-def create_sample_csv():
-    """Create sample employees CSV file in English"""
+FIELDNAMES = [
+    "employee_id", "first_name", "last_name", "full_name", "email", "phone", 
+    "department", "position", "salary", "hire_date", "city", "state", 
+    "zip_code", "is_active", "manager_id", "performance_score", 
+    "years_experience", "education_level", "remote_work"
+]
+
+# Hire dates of seeded runs end here, so the same seed gives the same file on any day
+SEED_REFERENCE_DATE = datetime(2025, 1, 1)
+
+def iter_employees(row_count=50, seed=None):
+    """Generate sample employee records one at a time"""
+    rng = random.Random(seed)
     
     # Sample data
     first_names = [
@@ -51,64 +63,66 @@ def create_sample_csv():
     
     states = ["CA", "NY", "TX", "FL", "IL", "PA", "OH", "GA", "NC", "MI", "NJ", "VA", "WA", "AZ", "MA", "TN", "IN", "MO", "MD", "WI"]
     
-    # Generate sample data
-    employees = []
+    # Generate random hire dates in the last 5 years
+    end_date = datetime.now() if seed is None else SEED_REFERENCE_DATE
+    start_date = end_date - timedelta(days=5*365)
     
-    for i in range(50):
-        first_name = random.choice(first_names)
-        last_name = random.choice(last_names)
+    for i in range(row_count):
+        first_name = rng.choice(first_names)
+        last_name = rng.choice(last_names)
         
-        # Generate random hire date (last 5 years)
-        start_date = datetime.now() - timedelta(days=5*365)
-        random_days = random.randint(0, 5*365)
+        random_days = rng.randint(0, 5*365)
         hire_date = start_date + timedelta(days=random_days)
         
-        employee = {
+        yield {
             "employee_id": f"EMP{str(i+1).zfill(4)}",
             "first_name": first_name,
             "last_name": last_name,
             "full_name": f"{first_name} {last_name}",
             "email": f"{first_name.lower()}.{last_name.lower()}@company.com",
-            "phone": f"+1-{random.randint(200,999)}-{random.randint(100,999)}-{random.randint(1000,9999)}",
-            "department": random.choice(departments),
-            "position": random.choice(positions),
-            "salary": random.randint(35000, 150000),
+            "phone": f"+1-{rng.randint(200,999)}-{rng.randint(100,999)}-{rng.randint(1000,9999)}",
+            "department": rng.choice(departments),
+            "position": rng.choice(positions),
+            "salary": rng.randint(35000, 150000),
             "hire_date": hire_date.strftime("%Y-%m-%d"),
-            "city": random.choice(cities),
-            "state": random.choice(states),
-            "zip_code": f"{random.randint(10000, 99999)}",
-            "is_active": random.choice([True, True, True, False]),  # 75% active
-            "manager_id": f"EMP{str(random.randint(1, min(i+1, 10))).zfill(4)}" if i > 0 else None,
-            "performance_score": round(random.uniform(2.5, 5.0), 1),
-            "years_experience": random.randint(1, 15),
-            "education_level": random.choice(["High School", "Bachelor's", "Master's", "PhD"]),
-            "remote_work": random.choice([True, False])
+            "city": rng.choice(cities),
+            "state": rng.choice(states),
+            "zip_code": f"{rng.randint(10000, 99999)}",
+            "is_active": rng.choice([True, True, True, False]),  # 75% active
+            "manager_id": f"EMP{str(rng.randint(1, min(i+1, 10))).zfill(4)}" if i > 0 else None,
+            "performance_score": round(rng.uniform(2.5, 5.0), 1),
+            "years_experience": rng.randint(1, 15),
+            "education_level": rng.choice(["High School", "Bachelor's", "Master's", "PhD"]),
+            "remote_work": rng.choice([True, False])
         }
-        
-        employees.append(employee)
-    
-    # Write to CSV
-    fieldnames = [
-        "employee_id", "first_name", "last_name", "full_name", "email", "phone", 
-        "department", "position", "salary", "hire_date", "city", "state", 
-        "zip_code", "is_active", "manager_id", "performance_score", 
-        "years_experience", "education_level", "remote_work"
-    ]
+
+def create_sample_csv(row_count=50, output_file='sample_employees.csv', seed=None, verbose=True):
+    """Create sample employees CSV file in English"""
     
-    with open('sample_employees.csv', 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+    # Rows are written as they are generated, so large files need little memory
+    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
         writer.writeheader()
-        writer.writerows(employees)
+        writer.writerows(iter_employees(row_count, seed))
+    
+    if not verbose:
+        return
     
     print("✅ Sample employees CSV file created successfully!")
-    print("📄 File: sample_employees.csv")
-    print(f"👥 Contains: {len(employees)} sample employee records")
+    print(f"📄 File: {output_file}")
+    print(f"👥 Contains: {row_count} sample employee records")
     print("\n📋 Columns included:")
-    for field in fieldnames:
+    for field in FIELDNAMES:
         print(f"   • {field}")
     
     print("\n🔧 Use this file to test your Firebase CSV Uploader!")
     print("🚀 You can upload this to different collections/sub-collections for testing.")
 
 if __name__ == "__main__":
-    create_sample_csv()
+    parser = argparse.ArgumentParser(description="Create a sample employees CSV file")
+    parser.add_argument("--rows", type=int, default=50, help="Number of employee records")
+    parser.add_argument("--output", default="sample_employees.csv", help="Output CSV file")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible files")
+    args = parser.parse_args()
+    
+    create_sample_csv(args.rows, args.output, args.seed)
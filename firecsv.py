@@ -0,0 +1,330 @@
+"""
+FireCSV Uploader - Command line interface
+Headless uploads, exports, deletes and statistics for scripts and cron jobs
+
+Usage:
+    python -m firecsv upload data/*.csv --collection employees --credentials key.json
+    python -m firecsv export employees employees.parquet --credentials key.json
+    python -m firecsv delete employees --recursive --yes --credentials key.json
+    python -m firecsv stats --credentials key.json
+
+Progress is written to stdout as JSON lines; diagnostics go to stderr.
+Ctrl+C (or SIGTERM) stops after the batches already sent are committed;
+press Ctrl+C again to abort at once.
+"""
+import argparse
+import contextlib
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from firebase.firebase_manager import FirebaseManager
+from firebase.collection_manager import CollectionManager
+from utils.csv_processor import CSVProcessor
+from utils.batch_committer import ENGINES, MAX_BATCH_SIZE
+from utils.jobs import Job
+from utils.metrics import JsonLinesSink, PrometheusSink
+from utils.upload_queue import UploadQueue, expand_sources, target_collection_path
+
+
+class JsonLines:
+    """Thread-safe writer of JSON-lines events"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.started = time.monotonic()
+        # Reentrant, since the signal handler emits from the main thread
+        # and may interrupt an emit in progress there
+        self._lock = threading.RLock()
+    
+    def emit(self, event: str, **fields):
+        """Write one event with the time elapsed since start"""
+        record = {'event': event, 'elapsed': round(time.monotonic() - self.started, 3)}
+        record.update(fields)
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def rate(count: int, started: float) -> float:
+    """Items per second since started"""
+    elapsed = time.monotonic() - started
+    return round(count / elapsed, 1) if elapsed > 0 else 0.0
+
+
+def split_columns(value: str) -> list:
+    """Split a comma-separated column list"""
+    return [column.strip() for column in (value or "").split(",") if column.strip()]
+
+
+def connect(args) -> FirebaseManager:
+    """Connect to Firebase with the service account from the arguments"""
+    if not args.credentials:
+        raise SystemExit("No credentials: pass --credentials or set FIRECSV_CREDENTIALS")
+    
+    firebase_manager = FirebaseManager()
+    if not firebase_manager.connect(args.credentials):
+        raise SystemExit(f"Failed to connect to Firebase with {args.credentials}")
+    return firebase_manager
+
+
+def run_upload(args, db, out: JsonLines, job: Job) -> bool:
+    files = expand_sources(args.files)
+    if not files:
+        raise SystemExit("No CSV files found")
+    
+    queue = UploadQueue(CSVProcessor(db), args.jobs, args.max_writes_per_second)
+    for file_path in files:
+        queue.add(file_path, target_collection_path(file_path, args.collection,
+                                                    args.sub_collection, args.subcol_mode))
+    
+    started = {}
+    
+    def job_callback(upload_job):
+        job_started = started.setdefault(upload_job.file_path, time.monotonic())
+        out.emit('upload', file=upload_job.file_path, collection=upload_job.collection_path,
+                 status=upload_job.status, rows=upload_job.uploaded, total=upload_job.total,
+                 rows_per_second=rate(upload_job.uploaded, job_started), success=upload_job.success)
+        if upload_job.success is not None:
+            out.emit('metrics', file=upload_job.file_path, metrics=upload_job.metrics.snapshot())
+    
+    sinks = []
+    if args.metrics_file:
+        sinks.append(JsonLinesSink(args.metrics_file))
+    if args.metrics_port:
+        sinks.append(PrometheusSink(args.metrics_port))
+    
+    try:
+        jobs = queue.run(
+            job_callback,
+            job=job,
+            resume=args.resume,
+            metrics_sinks=sinks,
+            batch_size=args.batch_size,
+            max_in_flight=args.concurrency,
+            engine=args.engine,
+            schema_path=args.schema,
+            id_columns=split_columns(args.id_columns),
+            hash_ids=args.hash_ids,
+            delta=args.delta
+        )
+    finally:
+        for sink in sinks:
+            sink.close()
+    
+    rows = sum(upload_job.uploaded for upload_job in jobs)
+    failed = [upload_job.file_path for upload_job in jobs if upload_job.success is False]
+    pending = [upload_job.file_path for upload_job in jobs if upload_job.success is None]
+    out.emit('done', command='upload', files=len(jobs), failed=failed, pending=pending, rows=rows,
+             rows_per_second=rate(rows, out.started), success=not failed and not pending)
+    return not failed and not pending
+
+
+def run_export(args, db, out: JsonLines, job: Job) -> bool:
+    started = time.monotonic()
+    
+    def progress_callback(count):
+        out.emit('export', collection=args.collection, documents=count,
+                 documents_per_second=rate(count, started))
+    
+    try:
+        success = CollectionManager(db).export_collection(
+            args.collection,
+            args.output,
+            file_format=args.format,
+            columns=split_columns(args.columns) or None,
+            header_mode=args.header_mode,
+            page_size=args.page_size,
+            progress_callback=progress_callback,
+            partitions=args.partitions,
+            shards=args.shards,
+            job=job
+        )
+    except Exception as e:
+        out.emit('error', command='export', collection=args.collection, message=str(e))
+        success = False
+    out.emit('done', command='export', collection=args.collection, output=args.output, success=success)
+    return success
+
+
+def run_delete(args, db, out: JsonLines, job: Job) -> bool:
+    if not args.yes:
+        raise SystemExit(f"Refusing to delete '{args.collection}' without --yes")
+    
+    def progress_callback(deleted, documents_per_second):
+        out.emit('delete', collection=args.collection, documents=deleted,
+                 documents_per_second=round(documents_per_second, 1))
+    
+    def status_callback(message):
+        out.emit('status', collection=args.collection, message=message)
+    
+    success = CollectionManager(db).delete_collection(
+        args.collection,
+        engine=args.engine,
+        max_in_flight=args.concurrency,
+        batch_size=args.batch_size,
+        recursive=args.recursive,
+        progress_callback=progress_callback,
+        status_callback=status_callback,
+        max_workers=args.concurrency,
+        job=job
+    )
+    out.emit('done', command='delete', collection=args.collection, success=success)
+    return success
+
+
+def run_stats(args, db, out: JsonLines, job: Job) -> bool:
+    collection_manager = CollectionManager(db)
+    
+    try:
+        if args.collection:
+            out.emit('stats', path=args.collection, **collection_manager.get_collection_stats(args.collection))
+            out.emit('done', command='stats', path=args.collection, success=True)
+        else:
+            collections = collection_manager.get_all_collections(
+                args.workers, callback=lambda info: out.emit('stats', **info)
+            )
+            out.emit('done', command='stats', collections=len(collections), success=True)
+    except Exception as e:
+        out.emit('error', command='stats', path=args.collection, message=str(e))
+        out.emit('done', command='stats', path=args.collection, success=False)
+        return False
+    return True
+
+
+def bounded_int(minimum: int = 1, maximum: Optional[int] = None) -> Callable[[str], int]:
+    """Argument type accepting whole numbers within the same limits as the GUI fields"""
+    def parse(value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            number = None
+        
+        if number is None or number < minimum or (maximum is not None and number > maximum):
+            limits = f"from {minimum} to {maximum}" if maximum is not None else f"of at least {minimum}"
+            raise argparse.ArgumentTypeError(f"must be a whole number {limits}, got {value!r}")
+        return number
+    
+    return parse
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="firecsv",
+        description="Upload CSV files to Firestore and manage collections without the GUI. "
+                    "Progress is written to stdout as JSON lines."
+    )
+    parser.add_argument("--credentials", default=os.environ.get("FIRECSV_CREDENTIALS"),
+                        help="Service account key JSON (default: $FIRECSV_CREDENTIALS)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    upload = commands.add_parser("upload", help="Upload CSV files")
+    upload.add_argument("files", nargs="+", help="CSV files, folders or glob patterns")
+    upload.add_argument("--collection", required=True, help="Main collection name")
+    upload.add_argument("--sub-collection", default="", help="Sub-collection name")
+    upload.add_argument("--subcol-mode", choices=["manual", "filename", "date"], default="manual",
+                        help="Sub-collection from --sub-collection, the file name, or today's date")
+    upload.add_argument("--batch-size", type=bounded_int(1, MAX_BATCH_SIZE), default=500)
+    upload.add_argument("--concurrency", type=bounded_int(), default=4, help="Concurrent batches per file")
+    upload.add_argument("--jobs", type=bounded_int(), default=1, help="Files uploaded at the same time")
+    upload.add_argument("--max-writes-per-second", type=float, default=None,
+                        help="Write budget shared by all files")
+    upload.add_argument("--engine", choices=ENGINES, default="batch")
+    upload.add_argument("--schema", help="JSON/YAML file overriding inferred column types")
+    upload.add_argument("--id-columns", help="Comma-separated columns forming document IDs")
+    upload.add_argument("--hash-ids", action="store_true", help="Use a hash of the row as document ID")
+    upload.add_argument("--delta", action="store_true", help="Only write new/changed rows, delete removed rows")
+    upload.add_argument("--resume", action="store_true", help="Resume interrupted uploads from their checkpoint")
+    upload.add_argument("--metrics-file", help="Append per-stage timings and throughput to a JSON-lines file")
+    upload.add_argument("--metrics-port", type=int,
+                        help="Serve metrics in Prometheus text format on this port while uploading")
+    upload.set_defaults(run=run_upload)
+    
+    export = commands.add_parser("export", help="Export a collection")
+    export.add_argument("collection", help="Collection path")
+    export.add_argument("output", help="Output file (.csv, .parquet, .arrow)")
+    export.add_argument("--format", choices=["csv", "parquet", "arrow"],
+                        help="Output format (default: from the file extension)")
+    export.add_argument("--columns", help="Comma-separated columns to export")
+    export.add_argument("--header-mode", choices=["spill", "sample"], default="spill")
+    export.add_argument("--page-size", type=bounded_int(), default=1000)
+    export.add_argument("--partitions", type=bounded_int(), default=1, help="Ranges read concurrently")
+    export.add_argument("--shards", action="store_true", help="Write one file per range")
+    export.set_defaults(run=run_export)
+    
+    delete = commands.add_parser("delete", help="Delete a collection")
+    delete.add_argument("collection", help="Collection path")
+    delete.add_argument("--recursive", action="store_true", help="Also delete all sub-collections")
+    delete.add_argument("--batch-size", type=bounded_int(1, MAX_BATCH_SIZE), default=500)
+    delete.add_argument("--concurrency", type=bounded_int(), default=4, help="Concurrent delete batches")
+    delete.add_argument("--engine", choices=ENGINES, default="batch")
+    delete.add_argument("--yes", action="store_true", help="Confirm the deletion")
+    delete.set_defaults(run=run_delete)
+    
+    stats = commands.add_parser("stats", help="Show collection statistics")
+    stats.add_argument("collection", nargs="?", help="Collection path (default: all collections)")
+    stats.add_argument("--workers", type=bounded_int(), default=8, help="Concurrent requests")
+    stats.set_defaults(run=run_stats)
+    
+    return parser
+
+
+@contextlib.contextmanager
+def cancel_on_signal(job: Job, out: JsonLines):
+    """
+    Cancel the job on the first SIGINT/SIGTERM; abort on a second Ctrl+C
+    
+    Cancelling lets in-flight batches commit and keeps the upload
+    checkpoint, so the command can be run again with --resume. Aborting
+    exits the process without waiting for them: the checkpoint journal is
+    flushed after every committed batch, so --resume still works, but
+    batches that were in flight may be written again.
+    """
+    def handle(signum, frame):
+        if job.cancelled:
+            # Raising here would only unwind into the executors, which
+            # wait for their in-flight batches like a cancel does
+            out.emit('aborted', signal=signal.Signals(signum).name)
+            sys.stderr.flush()
+            os._exit(130)
+        job.cancel()
+        out.emit('cancelled', signal=signal.Signals(signum).name)
+        print("Cancelling after in-flight batches... (press Ctrl+C again to abort)", file=sys.stderr)
+    
+    previous = {signum: signal.signal(signum, handle) for signum in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        yield
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+
+def main(argv=None) -> int:
+    """Main entry point"""
+    args = build_parser().parse_args(argv)
+    out = JsonLines(sys.stdout)
+    job = Job(args.command)
+    
+    # Keep stdout machine-readable: library messages go to stderr
+    with contextlib.redirect_stdout(sys.stderr), cancel_on_signal(job, out):
+        firebase_manager = connect(args)
+        try:
+            success = args.run(args, firebase_manager.get_client(), out, job)
+        finally:
+            firebase_manager.disconnect()
+    
+    if job.cancelled:
+        return 130
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
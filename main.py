@@ -3,9 +3,10 @@ FireCSV Uploader - Main Application
 A modern, modular Firebase CSV management tool
 """
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 import sys
 import os
+import time
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -15,6 +16,11 @@ from firebase.collection_manager import CollectionManager
 from utils.csv_processor import CSVProcessor
 from ui.upload_tab import UploadTab
 from ui.browse_tab import BrowseTab
+from ui.dispatcher import UIDispatcher
+from utils.jobs import JobManager
+
+# Seconds to wait for cancelled jobs to commit their in-flight batches on exit
+SHUTDOWN_TIMEOUT = 30
 
 
 class FireCSVUploader:
@@ -31,6 +37,12 @@ class FireCSVUploader:
         self.collection_manager = CollectionManager(None)  # Will be set when connected
         self.csv_processor = CSVProcessor(None)  # Will be set when connected
         
+        # Worker threads update widgets only through the dispatcher
+        self.dispatcher = UIDispatcher(self.root)
+        
+        # Uploads, exports and deletes run as cancellable background jobs
+        self.job_manager = JobManager()
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -52,8 +64,10 @@ class FireCSVUploader:
         notebook.add(browse_frame, text="Browse Collections")
         
         # Initialize tabs
-        self.upload_tab = UploadTab(upload_frame, self.firebase_manager, self.csv_processor)
-        self.browse_tab = BrowseTab(browse_frame, self.firebase_manager, self.collection_manager)
+        self.upload_tab = UploadTab(upload_frame, self.firebase_manager, self.csv_processor,
+                                    self.dispatcher, self.job_manager)
+        self.browse_tab = BrowseTab(browse_frame, self.firebase_manager, self.collection_manager,
+                                    self.dispatcher, self.job_manager)
         
         # Grid weights
         main_frame.columnconfigure(0, weight=1)
@@ -67,7 +81,33 @@ class FireCSVUploader:
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
     
     def on_closing(self):
-        """Handle application closing"""
+        """Handle application closing; running jobs are cancelled first"""
+        if self.job_manager.running():
+            if not messagebox.askyesno(
+                "Jobs Running",
+                "An upload, export or delete is still running.\n\n"
+                "Cancel it and exit? Batches already sent are committed first, "
+                "and a cancelled upload can be resumed later."
+            ):
+                return
+            
+            self.job_manager.cancel_all()
+            self.root.title("FireCSV Uploader v2.0 - closing...")
+            self.root.protocol("WM_DELETE_WINDOW", lambda: None)
+            self._wait_for_jobs(time.monotonic() + SHUTDOWN_TIMEOUT)
+            return
+        
+        self._close()
+    
+    def _wait_for_jobs(self, deadline: float):
+        """Keep the event loop running until cancelled jobs stop or the deadline passes"""
+        if self.job_manager.running() and time.monotonic() < deadline:
+            self.root.after(100, self._wait_for_jobs, deadline)
+        else:
+            self._close()
+    
+    def _close(self):
+        self.dispatcher.close()
         self.firebase_manager.disconnect()
         self.root.destroy()
 
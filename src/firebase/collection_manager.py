@@ -2,77 +2,179 @@
 Firestore collection management utilities
 """
 import csv
-from typing import List, Dict, Any, Optional
-from firebase_admin import firestore
+import os
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from datetime import datetime
+from itertools import chain, islice
+from typing import TYPE_CHECKING, List, Dict, Any, BinaryIO, Callable, Iterable, Iterator, Optional, Set
+
+from firebase.columnar_writer import COLUMNAR_FORMATS, export_format, value_kind, write_columnar
+from utils.batch_committer import check_batch_settings, create_committer
+from utils.jobs import Job, JobCancelled
+
+# The Firestore SDK is slow to import; it is only needed once connected
+if TYPE_CHECKING:
+    from google.cloud import firestore
 
 
 class CollectionManager:
     """Manages Firestore collections operations"""
     
-    def __init__(self, db: firestore.Client):
+    def __init__(self, db: Optional["firestore.Client"]):
         self.db = db
     
-    def get_all_collections(self) -> List[Dict[str, Any]]:
+    def get_all_collections(self, max_workers: int = 8,
+                            callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
         """
         Get all collections with their statistics
         
+        Statistics for collections and sub-collections are fetched
+        concurrently; results arrive in completion order.
+        
+        Args:
+            max_workers: Maximum number of concurrent Firestore requests
+            callback: Called with each collection's information as soon as it is fetched
+        
         Returns:
             List of collection information dictionaries
         """
         collections_info = []
-        collections = self.db.collections()
-        
-        for collection in collections:
-            collection_name = collection.id
-            
-            # Get document count and last modified
-            docs = list(collection.limit(1000).stream())
-            doc_count = len(docs)
-            
-            last_modified = "N/A"
-            if docs:
-                first_doc = docs[0]
-                doc_data = first_doc.to_dict()
-                if '_upload_info' in doc_data:
-                    upload_info = doc_data['_upload_info']
-                    if 'uploaded_at' in upload_info:
-                        last_modified = upload_info['uploaded_at'].strftime("%Y-%m-%d %H:%M")
-            
-            collections_info.append({
-                'name': collection_name,
-                'type': 'Collection',
-                'count': doc_count,
-                'last_modified': last_modified,
-                'path': collection_name
-            })
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                thread_name_prefix="collection-stats") as executor:
+            # Each future maps to the handler that consumes its result
+            pending: Dict[Future, Callable[[Any], None]] = {}
+            
+            def submit(handler: Callable[[Any], None], fn: Callable, *args):
+                pending[executor.submit(fn, *args)] = handler
+            
+            def add_info(info: Dict[str, Any]):
+                collections_info.append(info)
+                if callback:
+                    callback(info)
+            
+            def add_sub_collections(collection_name: str, doc_id: str, sub_collections):
+                for sub_collection in sub_collections:
+                    submit(add_info, self._collection_info, sub_collection,
+                           f"{doc_id}/{sub_collection.id}", 'Sub-Collection',
+                           f"{collection_name}/{doc_id}/{sub_collection.id}", collection_name)
+            
+            def find_sub_collections(collection_name: str, doc_refs):
+                # Check for sub-collections under the first documents
+                for doc_ref in doc_refs:
+                    submit(partial(add_sub_collections, collection_name, doc_ref.id),
+                           self._list_sub_collections, doc_ref)
             
-            # Check for sub-collections
-            for doc in collection.limit(10).stream():
-                doc_collections = doc.reference.collections()
-                for sub_collection in doc_collections:
-                    sub_docs = list(sub_collection.limit(100).stream())
-                    sub_count = len(sub_docs)
-                    
-                    sub_last_modified = "N/A"
-                    if sub_docs:
-                        first_sub_doc = sub_docs[0]
-                        sub_doc_data = first_sub_doc.to_dict()
-                        if '_upload_info' in sub_doc_data:
-                            sub_upload_info = sub_doc_data['_upload_info']
-                            if 'uploaded_at' in sub_upload_info:
-                                sub_last_modified = sub_upload_info['uploaded_at'].strftime("%Y-%m-%d %H:%M")
-                    
-                    collections_info.append({
-                        'name': f"{doc.id}/{sub_collection.id}",
-                        'type': 'Sub-Collection',
-                        'count': sub_count,
-                        'last_modified': sub_last_modified,
-                        'path': f"{collection_name}/{doc.id}/{sub_collection.id}",
-                        'parent': collection_name
-                    })
+            for collection in self.db.collections():
+                submit(add_info, self._collection_info, collection, collection.id, 'Collection',
+                       collection.id, None)
+                submit(partial(find_sub_collections, collection.id),
+                       self._first_document_refs, collection, 10)
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    handler = pending.pop(future)
+                    handler(future.result())
         
         return collections_info
     
+    def _first_document_refs(self, collection, limit: int) -> List[Any]:
+        """
+        Get references of the first documents of a collection, including
+        documents that only exist as parents of sub-collections
+        """
+        return list(islice(collection.list_documents(page_size=limit), limit))
+    
+    def _list_sub_collections(self, doc_ref) -> List[Any]:
+        """Get sub-collections of a document"""
+        return list(doc_ref.collections())
+    
+    def _count_documents(self, query) -> int:
+        """Count documents matching a collection or query with a count() aggregation"""
+        return query.count().get()[0][0].value
+    
+    def _collection_info(self, collection, name: str, collection_type: str,
+                         path: str, parent: Optional[str]) -> Dict[str, Any]:
+        """Build collection information with its statistics"""
+        info = {
+            'name': name,
+            'type': collection_type,
+            'path': path
+        }
+        info.update(self._collection_stats(collection))
+        if parent is not None:
+            info['parent'] = parent
+        return info
+    
+    def _collection_stats(self, collection) -> Dict[str, Any]:
+        """Fetch document count and last modified date of a collection"""
+        # Exact count via a server-side aggregation, without reading documents
+        doc_count = self._count_documents(collection)
+        
+        # Last modified from the first document's upload metadata
+        last_modified = "N/A"
+        for first_doc in collection.limit(1).stream():
+            doc_data = first_doc.to_dict()
+            if '_upload_info' in doc_data:
+                upload_info = doc_data['_upload_info']
+                if 'uploaded_at' in upload_info:
+                    last_modified = upload_info['uploaded_at'].strftime("%Y-%m-%d %H:%M")
+        
+        return {'count': doc_count, 'last_modified': last_modified}
+    
+    def get_collection_stats(self, collection_path: str) -> Dict[str, Any]:
+        """
+        Get statistics of a single collection
+        
+        Args:
+            collection_path: Path to collection
+            
+        Returns:
+            Dictionary with count and last_modified
+        """
+        return self._collection_stats(self._get_collection_ref(collection_path))
+    
+    def list_collections(self, document_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List collections without fetching any statistics
+        
+        Args:
+            document_path: Document whose sub-collections to list, or None
+                for the root collections
+            
+        Returns:
+            List of dictionaries with name, type and path
+        """
+        if document_path:
+            collections = self.db.document(document_path).collections()
+            return [{'name': collection.id, 'type': 'Sub-Collection',
+                     'path': f"{document_path}/{collection.id}"} for collection in collections]
+        
+        return [{'name': collection.id, 'type': 'Collection', 'path': collection.id}
+                for collection in self.db.collections()]
+    
+    def iter_document_refs(self, collection_path: str, page_size: int = 100) -> Iterator[Any]:
+        """
+        Lazily iterate over document references of a collection
+        
+        Documents are fetched page by page as the iterator advances, and
+        include documents that only exist as parents of sub-collections.
+        
+        Args:
+            collection_path: Path to collection
+            page_size: Number of references fetched per request
+            
+        Returns:
+            Iterator of document references
+        """
+        return self._get_collection_ref(collection_path).list_documents(page_size=page_size)
+    
     def get_collection_documents(self, collection_path: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Get sample documents from a collection
@@ -96,78 +198,435 @@ class CollectionManager:
         
         return documents
     
-    def export_collection_to_csv(self, collection_path: str, output_file: str) -> bool:
+    def get_documents_page(self, collection_path: str, page_size: int = 50,
+                           start_after: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get one page of documents ordered by document ID
+        
+        Args:
+            collection_path: Path to collection
+            page_size: Maximum number of documents to retrieve
+            start_after: ID of the last document of the previous page
+            
+        Returns:
+            List of document dictionaries
+        """
+        query = self._get_collection_ref(collection_path).order_by('__name__').limit(page_size)
+        if start_after:
+            query = query.start_after({'__name__': start_after})
+        
+        return [{'id': doc.id, 'data': doc.to_dict()} for doc in query.stream()]
+    
+    def iter_documents(self, collection_path: str, page_size: int = 1000,
+                       start_after: Optional[str] = None, start_at: Optional[str] = None,
+                       end_before: Optional[str] = None, job: Optional[Job] = None) -> Iterator[Any]:
+        """
+        Stream every document of a collection, one cursor page at a time
+        
+        Args:
+            collection_path: Path to collection
+            page_size: Number of documents fetched per request
+            start_after: Document ID to continue after
+            start_at: First document ID of the range (inclusive)
+            end_before: Document ID ending the range (exclusive)
+            job: Checked before each page; pauses the stream or raises JobCancelled
+            
+        Yields:
+            Document snapshots ordered by document ID
+        """
+        query = self._get_collection_ref(collection_path).order_by('__name__')
+        if end_before:
+            query = query.end_before({'__name__': end_before})
+        cursor = start_after
+        
+        while True:
+            if job:
+                job.checkpoint()
+            
+            page_query = query.limit(page_size)
+            if cursor:
+                page_query = page_query.start_after({'__name__': cursor})
+            elif start_at:
+                page_query = page_query.start_at({'__name__': start_at})
+            
+            page = list(page_query.stream())
+            yield from page
+            
+            if len(page) < page_size:
+                return
+            cursor = page[-1].id
+    
+    def export_collection_to_csv(self, collection_path: str, output_file: str,
+                                 columns: Optional[List[str]] = None,
+                                 header_mode: str = "spill",
+                                 sample_size: int = 1000,
+                                 page_size: int = 1000,
+                                 progress_callback: Optional[Callable[[int], None]] = None,
+                                 partitions: int = 1, shards: bool = False) -> bool:
         """
         Export collection to CSV file
         
+        See export_collection for the arguments.
+        
+        Returns:
+            bool: True if documents were exported, False if the collection
+            is empty
+        """
+        return self.export_collection(collection_path, output_file, "csv", columns, header_mode,
+                                      sample_size, page_size, progress_callback, partitions, shards)
+    
+    def export_collection(self, collection_path: str, output_file: str,
+                          file_format: Optional[str] = None,
+                          columns: Optional[List[str]] = None,
+                          header_mode: str = "spill",
+                          sample_size: int = 1000,
+                          page_size: int = 1000,
+                          progress_callback: Optional[Callable[[int], None]] = None,
+                          partitions: int = 1, shards: bool = False,
+                          row_group_size: int = 10000, job: Optional[Job] = None) -> bool:
+        """
+        Export collection to a CSV, Parquet or Arrow IPC file
+        
+        Documents are streamed page by page, so memory does not grow with
+        the collection size. The columns come from, in order of preference:
+        
+        - columns, when given (other fields are left out)
+        - "sample": the fields of the first sample_size documents (fields
+          that only appear later are left out; CSV only)
+        - "spill": every field of every document; documents are spilled to
+          a temporary file next to the output while the fields are collected
+        
+        Parquet and Arrow files always spill, since column types are taken
+        from all values: a column holding only bools, ints, floats (ints
+        allowed) or timestamps keeps that type, anything else is text.
+        Row groups are written incrementally. These formats need pyarrow.
+        
+        With partitions > 1 the collection is split into document ID ranges
+        that are read concurrently, one worker per range. Every range is
+        spilled, and the ranges are then merged into output_file in document
+        order, or written as one shard file per range when shards is set.
+        
         Args:
             collection_path: Path to collection
-            output_file: Output CSV file path
+            output_file: Output file path
+            file_format: "csv", "parquet" or "arrow"; taken from the output
+                         file extension when not given
+            columns: Explicit list of columns to export
+            header_mode: "spill" or "sample", used when columns is not given
+            sample_size: Number of documents sampled in "sample" mode
+            page_size: Number of documents fetched per request
+            progress_callback: Callback with the number of exported documents
+            partitions: Number of ranges to read concurrently
+            shards: Write one file per range (name-00000-of-00004.csv)
+                    instead of merging them
+            row_group_size: Documents per Parquet row group / Arrow record batch
+            job: Pauses or cancels the export between pages; output and shard
+                 files it already started writing are removed when cancelled
             
         Returns:
-            bool: True if export successful, False otherwise
+            bool: True if documents were exported, False if the collection
+            is empty or the export was cancelled; no output file is left
+            behind in either case
+            
+        Raises:
+            Exception: Errors reading the collection or writing the output
+                are raised after the files this export started are removed
         """
+        created: List[str] = []
+        
+        def remove_created():
+            # Only files this export wrote; a file already at the path stays
+            # untouched when the export stopped before writing
+            for path in created:
+                if os.path.exists(path):
+                    os.remove(path)
+        
         try:
-            collection_ref = self._get_collection_ref(collection_path)
-            docs = list(collection_ref.stream())
+            file_format = file_format or export_format(output_file)
+            if file_format != "csv" and file_format not in COLUMNAR_FORMATS:
+                raise ValueError(f"Unknown export format: {file_format}")
             
-            if not docs:
+            def write(documents: Iterable[Dict[str, Any]], field_kinds: Dict[str, Set[str]],
+                      path: str, callback: Optional[Callable[[int], None]] = None) -> int:
+                created.append(path)
+                if columns:
+                    field_kinds = {column: field_kinds.get(column, set()) for column in columns}
+                if file_format == "csv":
+                    return self._write_csv(documents, list(field_kinds), path, callback)
+                count = write_columnar(documents, field_kinds, path, file_format, row_group_size)
+                if callback:
+                    callback(count)
+                return count
+            
+            documents = (self._export_row(doc)
+                         for doc in self.iter_documents(collection_path, page_size, job=job))
+            
+            if partitions > 1 or shards:
+                exported = self._export_partitioned(collection_path, output_file, partitions,
+                                                    page_size, shards, write, progress_callback, job)
+            elif file_format == "csv" and columns:
+                created.append(output_file)
+                exported = self._write_csv(documents, list(columns), output_file, progress_callback) > 0
+            elif file_format == "csv" and header_mode == "sample":
+                # Buffer the sample, then keep streaming behind it
+                sample = list(islice(documents, sample_size))
+                fieldnames = sorted(set().union(*sample)) if sample else []
+                documents = chain(sample, documents)
+                created.append(output_file)
+                exported = self._write_csv(documents, fieldnames, output_file, progress_callback) > 0
+            elif header_mode not in ("spill", "sample"):
+                raise ValueError(f"Unknown header mode: {header_mode}")
+            else:
+                exported = self._export_spilled(documents, output_file, write, progress_callback)
+            
+        except JobCancelled:
+            print("Export cancelled")
+            remove_created()
+            return False
+            
+        except Exception:
+            # Leave no partial output behind; the caller reports the error
+            remove_created()
+            raise
+        
+        if not exported:
+            # An empty collection leaves no header-only file behind
+            remove_created()
+        return exported
+    
+    def _export_row(self, doc) -> Dict[str, Any]:
+        """Document data as exported, without upload metadata"""
+        doc_data = doc.to_dict()
+        # Remove metadata field from export
+        doc_data.pop('_upload_info', None)
+        return doc_data
+    
+    def _export_spilled(self, documents: Iterable[Dict[str, Any]], output_file: str, write: Callable,
+                        progress_callback: Optional[Callable[[int], None]] = None) -> bool:
+        """Spill documents to a temporary file while collecting all fields, then write the output"""
+        spill_dir = os.path.dirname(os.path.abspath(output_file))
+        
+        with tempfile.TemporaryFile(dir=spill_dir, prefix=".export-spill-") as spill:
+            field_kinds, count = _spill_documents(documents, spill)
+            
+            if not count:
                 return False
             
-            # Get all field names
-            all_fields = set()
-            doc_data_list = []
+            spill.seek(0)
+            return write(_read_spill(spill), field_kinds, output_file, progress_callback) > 0
+    
+    def _partition_split_ids(self, collection_path: str, partitions: int) -> List[str]:
+        """
+        Get document IDs that split a collection into up to `partitions` ranges
+        
+        Split points come from a collection group partition query; points
+        that belong to other collections with the same ID are dropped. Sub-
+        collections share their ID (every upload writes to `<main>/<sub>/data`),
+        so when too few points are left, or partition queries are unavailable,
+        the IDs are found by stepping through the collection in ID order.
+        """
+        if partitions <= 1:
+            return []
+        
+        collection_id = collection_path.rsplit('/', 1)[-1]
+        try:
+            query = self.db.collection_group(collection_id)
+            split_ids = {
+                partition.end_at.id
+                for partition in query.get_partitions(partitions)
+                if partition.end_at is not None
+                and partition.end_at.path.rsplit('/', 1)[0] == collection_path
+            }
+        except Exception as e:
+            print(f"Partition query failed: {str(e)}")
+            split_ids = set()
+        
+        if len(split_ids) >= partitions - 1:
+            return sorted(split_ids)
+        
+        try:
+            split_ids = self._offset_split_ids(collection_path, partitions)
+        except Exception as e:
+            print(f"Could not split '{collection_path}', exporting as a single range: {str(e)}")
+            return []
+        
+        if not split_ids:
+            print(f"'{collection_path}' is too small to split, exporting as a single range")
+        return split_ids
+    
+    def _offset_split_ids(self, collection_path: str, partitions: int) -> List[str]:
+        """
+        Split a collection into equal document ID ranges with offset queries
+        
+        Each query skips ahead from the previous split point, so the index
+        entries of the collection are scanned once, keys only.
+        """
+        collection_ref = self._get_collection_ref(collection_path)
+        step = -(-self._count_documents(collection_ref) // partitions)
+        if step < 2:
+            return []
+        
+        query = collection_ref.order_by('__name__').select([])
+        split_ids = []
+        for _ in range(partitions - 1):
+            if split_ids:
+                page_query = query.start_after({'__name__': split_ids[-1]}).offset(step - 1)
+            else:
+                page_query = query.offset(step)
+            docs = list(page_query.limit(1).stream())
+            if not docs:
+                break
+            split_ids.append(docs[0].id)
+        
+        return split_ids
+    
+    def _export_partitioned(self, collection_path: str, output_file: str, partitions: int,
+                            page_size: int, shards: bool, write: Callable,
+                            progress_callback: Optional[Callable[[int], None]] = None,
+                            job: Optional[Job] = None) -> bool:
+        """Read document ID ranges concurrently, then merge or shard them into output files"""
+        split_ids = self._partition_split_ids(collection_path, partitions)
+        ranges = list(zip([None] + split_ids, split_ids + [None]))
+        spill_dir = os.path.dirname(os.path.abspath(output_file))
+        
+        lock = threading.Lock()
+        exported = 0
+        
+        def count_read(documents: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            nonlocal exported
+            for doc_data in documents:
+                yield doc_data
+                with lock:
+                    exported += 1
+                    if progress_callback and exported % 1000 == 0:
+                        progress_callback(exported)
+        
+        def spill_range(spill: BinaryIO, start_at: Optional[str], end_before: Optional[str]):
+            documents = self.iter_documents(collection_path, page_size,
+                                            start_at=start_at, end_before=end_before, job=job)
+            return _spill_documents(count_read(self._export_row(doc) for doc in documents), spill)
+        
+        spills = [tempfile.TemporaryFile(dir=spill_dir, prefix=".export-spill-") for _ in ranges]
+        try:
+            with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="export") as executor:
+                results = list(executor.map(spill_range, spills, *zip(*ranges)))
             
-            for doc in docs:
-                doc_data = doc.to_dict()
-                all_fields.update(doc_data.keys())
-                doc_data_list.append(doc_data)
+            if progress_callback:
+                progress_callback(exported)
+            if not exported:
+                return False
             
-            # Remove metadata field from export
-            all_fields.discard('_upload_info')
-            all_fields = sorted(list(all_fields))
+            field_kinds = _merge_field_kinds(field_kinds for field_kinds, _ in results)
+            for spill in spills:
+                spill.seek(0)
             
-            # Write to CSV
-            with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=all_fields)
-                writer.writeheader()
-                
-                for doc_data in doc_data_list:
-                    # Remove metadata and write row
-                    doc_data.pop('_upload_info', None)
-                    writer.writerow(doc_data)
+            if not shards:
+                documents = chain.from_iterable(_read_spill(spill) for spill in spills)
+                return write(documents, field_kinds, output_file) > 0
             
+            root, ext = os.path.splitext(output_file)
+            shard_files = [f"{root}-{index:05d}-of-{len(spills):05d}{ext or '.csv'}"
+                           for index in range(len(spills))]
+            with ThreadPoolExecutor(max_workers=len(spills), thread_name_prefix="export") as executor:
+                list(executor.map(lambda spill, shard_file: write(_read_spill(spill), field_kinds, shard_file),
+                                  spills, shard_files))
             return True
+        finally:
+            for spill in spills:
+                spill.close()
+    
+    def _write_csv(self, documents: Iterable[Dict[str, Any]], fieldnames: List[str], output_file: str,
+                   progress_callback: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Write documents to a CSV file as they arrive
+        
+        Returns:
+            Number of documents written
+        """
+        count = 0
+        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
+            writer.writeheader()
             
-        except Exception as e:
-            print(f"Export error: {str(e)}")
-            return False
+            for doc_data in documents:
+                writer.writerow(doc_data)
+                count += 1
+                if progress_callback and count % 1000 == 0:
+                    progress_callback(count)
+        
+        if progress_callback:
+            progress_callback(count)
+        return count
     
-    def delete_collection(self, collection_path: str) -> bool:
+    def delete_collection(self, collection_path: str, engine: str = "batch", max_in_flight: int = 4,
+                          batch_size: int = 500, recursive: bool = False,
+                          progress_callback: Optional[Callable[[int, float], None]] = None,
+                          status_callback: Optional[Callable[[str], None]] = None,
+                          max_workers: int = 8, job: Optional[Job] = None) -> bool:
         """
         Delete all documents in a collection
         
+        Only document references are fetched (a key-only query), and the
+        deletes are committed concurrently while the next page of
+        references is read.
+        
         Args:
             collection_path: Path to collection
+            engine: Commit engine, "batch" or "bulk_writer"
+            max_in_flight: Number of concurrent delete batches
+            batch_size: Number of deletes per batch
+            recursive: Also delete every sub-collection below the collection
+            progress_callback: Called with (deleted documents, documents per second)
+            status_callback: Called with per-level progress messages when recursive
+            max_workers: Concurrent sub-collection listings when recursive
+            job: Pauses or cancels the delete between batches; batches already
+                 sent are still committed
             
         Returns:
             bool: True if deletion successful, False otherwise
+            
+        Raises:
+            ValueError: If batch_size or max_in_flight is out of range
         """
+        check_batch_settings(batch_size, max_in_flight)
         try:
-            collection_ref = self._get_collection_ref(collection_path)
-            
-            # Delete all documents in batches
+            started = time.monotonic()
             deleted_count = 0
-            while True:
-                docs = list(collection_ref.limit(500).stream())
-                if not docs:
-                    break
+            
+            def report(count: int):
+                nonlocal deleted_count
+                deleted_count += count
+                if progress_callback:
+                    elapsed = time.monotonic() - started
+                    progress_callback(deleted_count, deleted_count / elapsed if elapsed > 0 else 0.0)
+            
+            cancelled = False
+            
+            with create_committer(self.db, engine, max_in_flight, batch_size) as committer:
+                def delete(doc_refs: List[Any]):
+                    if job:
+                        job.checkpoint()
+                    for count in committer.submit([(doc_ref, None) for doc_ref in doc_refs], len(doc_refs)):
+                        report(count)
+                
+                collection_ref = self._get_collection_ref(collection_path)
+                try:
+                    if recursive:
+                        self._delete_tree(collection_ref, delete, batch_size, max_workers, status_callback)
+                    else:
+                        for doc_refs in self._iter_key_pages(collection_ref, batch_size):
+                            delete(doc_refs)
+                except JobCancelled:
+                    cancelled = True
                 
-                batch = self.db.batch()
-                for doc in docs:
-                    batch.delete(doc.reference)
-                    deleted_count += 1
-                batch.commit()
+                # Batches already sent are committed, also when cancelled
+                for count in committer.drain():
+                    report(count)
+            
+            if cancelled:
+                if status_callback:
+                    status_callback(f"Delete cancelled after {deleted_count} documents")
+                return False
             
             return True
             
@@ -175,16 +634,133 @@ class CollectionManager:
             print(f"Delete error: {str(e)}")
             return False
     
+    def _delete_tree(self, collection_ref, delete: Callable[[List[Any]], None], page_size: int,
+                     max_workers: int, status_callback: Optional[Callable[[str], None]] = None):
+        """
+        Delete a collection and all collections below it, breadth-first
+        
+        Each level's document references are streamed page by page (including
+        documents that only exist as parents of sub-collections) and handed
+        to delete, while a worker pool lists every document's sub-collections
+        to build the next level.
+        """
+        max_workers = max(1, max_workers)
+        level = [collection_ref]
+        depth = 0
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="delete-tree") as executor:
+            while level:
+                depth += 1
+                next_level = []
+                pending = set()
+                level_count = 0
+                
+                def collect(done):
+                    for future in done:
+                        next_level.extend(future.result())
+                
+                for collection in level:
+                    doc_refs_iter = collection.list_documents(page_size=page_size)
+                    while True:
+                        doc_refs = list(islice(doc_refs_iter, page_size))
+                        if not doc_refs:
+                            break
+                        
+                        for doc_ref in doc_refs:
+                            # Bound the listing queue so references are not materialized
+                            if len(pending) >= max_workers * 4:
+                                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                                collect(done)
+                            pending.add(executor.submit(_list_collections, doc_ref))
+                        
+                        delete(doc_refs)
+                        level_count += len(doc_refs)
+                        if status_callback:
+                            status_callback(f"Level {depth}: deleting {level_count} documents "
+                                            f"in {len(level)} collections...")
+                
+                collect(wait(pending).done)
+                if status_callback:
+                    status_callback(f"Level {depth}: {level_count} documents in {len(level)} collections deleted, "
+                                    f"{len(next_level)} sub-collections found")
+                level = next_level
+    
+    def _iter_key_pages(self, collection_ref, page_size: int) -> Iterator[List[Any]]:
+        """
+        Stream document references of a collection, one page at a time
+        
+        The query selects no fields, so document bodies are not downloaded.
+        """
+        from google.cloud.firestore_v1.field_path import FieldPath
+        
+        query = collection_ref.select([FieldPath.document_id()]).order_by('__name__')
+        cursor = None
+        
+        while True:
+            page_query = query.limit(page_size)
+            if cursor:
+                page_query = page_query.start_after({'__name__': cursor})
+            
+            doc_refs = [doc.reference for doc in page_query.stream()]
+            if doc_refs:
+                yield doc_refs
+            
+            if len(doc_refs) < page_size:
+                return
+            cursor = doc_refs[-1].id
+    
     def _get_collection_ref(self, collection_path: str):
         """Get collection reference based on path"""
-        if "/" in collection_path and collection_path.count("/") >= 2:
-            # Sub-collection path: main_collection/doc_id/sub_collection
-            parts = collection_path.split("/")
-            main_collection = parts[0]
-            doc_id = parts[1]
-            sub_collection = parts[2]
-            
-            return self.db.collection(main_collection).document(doc_id).collection(sub_collection)
-        else:
-            # Main collection
-            return self.db.collection(collection_path)
+        # Paths alternate collection/document/collection, e.g.
+        # main_collection/doc_id/sub_collection, at any depth
+        return self.db.collection(*collection_path.split("/"))
+
+
+# Values kept as-is in export spill files; anything else is spilled as text
+_SPILL_TYPES = (type(None), bool, int, float, str, bytes, datetime)
+
+
+def _list_collections(doc_ref) -> List[Any]:
+    """List the sub-collections of a document"""
+    return list(doc_ref.collections())
+
+
+def _spill_value(value: Any) -> Any:
+    """Make a Firestore value picklable, keeping its type where possible"""
+    return value if isinstance(value, _SPILL_TYPES) else str(value)
+
+
+def _spill_documents(documents: Iterable[Dict[str, Any]], spill: BinaryIO) -> tuple:
+    """
+    Write documents to a spill file
+    
+    Returns:
+        Tuple of (field names mapped to the value kinds seen, number of documents)
+    """
+    field_kinds: Dict[str, Set[str]] = {}
+    count = 0
+    for doc_data in documents:
+        doc_data = {key: _spill_value(value) for key, value in doc_data.items()}
+        for key, value in doc_data.items():
+            field_kinds.setdefault(key, set()).add(value_kind(value))
+        pickle.dump(doc_data, spill)
+        count += 1
+    return _merge_field_kinds([field_kinds]), count
+
+
+def _merge_field_kinds(all_field_kinds: Iterable[Dict[str, Set[str]]]) -> Dict[str, Set[str]]:
+    """Merge field kinds, with fields sorted by name"""
+    merged: Dict[str, Set[str]] = {}
+    for field_kinds in all_field_kinds:
+        for field, kinds in field_kinds.items():
+            merged.setdefault(field, set()).update(kinds)
+    return dict(sorted(merged.items()))
+
+
+def _read_spill(spill: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Read back documents written to a spill file"""
+    while True:
+        try:
+            yield pickle.load(spill)
+        except EOFError:
+            return
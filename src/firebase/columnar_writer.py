@@ -0,0 +1,147 @@
+"""
+Columnar (Parquet / Arrow IPC) export writers
+
+pyarrow is optional and only imported when a columnar file is written.
+"""
+import importlib.util
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Set
+
+# Export formats by file extension
+EXPORT_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+
+def export_format(output_file: str) -> str:
+    """
+    Get the export format for an output file from its extension
+    
+    Unknown extensions are exported as CSV.
+    """
+    for extension, file_format in EXPORT_FORMATS.items():
+        if output_file.lower().endswith(extension):
+            return file_format
+    return "csv"
+
+
+def value_kind(value: Any) -> str:
+    """
+    Classify a document value for column typing
+    
+    Returns:
+        One of "null", "bool", "int", "bigint", "float", "timestamp",
+        "timestamp_tz", "bytes" or "string"
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int" if _INT64_MIN <= value <= _INT64_MAX else "bigint"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, datetime):
+        return "timestamp_tz" if value.tzinfo is not None else "timestamp"
+    if isinstance(value, bytes):
+        return "bytes"
+    return "string"
+
+
+def pyarrow_available() -> bool:
+    """Check whether pyarrow is installed, without importing it"""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("pyarrow is required for Parquet and Arrow exports (pip install pyarrow)")
+    return pyarrow
+
+
+def _arrow_type(pa, kinds: Set[str]):
+    """Pick the Arrow type for a column from the kinds of its values"""
+    kinds = kinds - {"null"}
+    if not kinds:
+        return pa.string()
+    if kinds == {"bool"}:
+        return pa.bool_()
+    if kinds == {"int"}:
+        return pa.int64()
+    if kinds <= {"int", "float"}:
+        return pa.float64()
+    if kinds == {"timestamp_tz"}:
+        return pa.timestamp("us", tz="UTC")
+    if kinds == {"timestamp"}:
+        return pa.timestamp("us")
+    if kinds == {"bytes"}:
+        return pa.binary()
+    # Mixed or unsupported values are written as their text form
+    return pa.string()
+
+
+def _column_values(pa, rows: List[Dict[str, Any]], field: str, arrow_type) -> Any:
+    values = [row.get(field) for row in rows]
+    if arrow_type == pa.string():
+        values = [None if value is None else str(value) for value in values]
+    elif arrow_type == pa.float64():
+        values = [None if value is None else float(value) for value in values]
+    return pa.array(values, type=arrow_type)
+
+
+def write_columnar(documents: Iterable[Dict[str, Any]], field_kinds: Dict[str, Set[str]],
+                   output_file: str, file_format: str, row_group_size: int = 10000) -> int:
+    """
+    Write documents to a Parquet or Arrow IPC file, one row group at a time
+    
+    Args:
+        documents: Document data dictionaries
+        field_kinds: Column names mapped to the value kinds seen in them
+        output_file: Output file path
+        file_format: "parquet" or "arrow"
+        row_group_size: Number of documents per row group / record batch
+    
+    Returns:
+        Number of documents written
+    """
+    if file_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown columnar format: {file_format}")
+    
+    pa = _import_pyarrow()
+    schema = pa.schema([(field, _arrow_type(pa, kinds)) for field, kinds in field_kinds.items()])
+    
+    if file_format == "parquet":
+        writer = pa.parquet.ParquetWriter(output_file, schema)
+        write = writer.write_table
+    else:
+        writer = pa.ipc.new_file(output_file, schema)
+        write = writer.write
+    
+    count = 0
+    documents = iter(documents)
+    try:
+        while True:
+            rows = list(islice(documents, row_group_size))
+            if not rows:
+                break
+            
+            arrays = [_column_values(pa, rows, column.name, column.type) for column in schema]
+            write(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(rows)
+    finally:
+        writer.close()
+    
+    return count
@@ -0,0 +1,99 @@
+"""
+Cursor-based document paging utilities
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+
+class DocumentPager:
+    """
+    Pages through a collection with start_after cursors
+    
+    Fetched pages are kept in a bounded LRU cache so going back is served
+    from memory, and the page after the current one is prefetched in the
+    background. Only the ID of each page's last document is kept as cursor
+    for pages that were evicted from the cache.
+    """
+    
+    def __init__(self, collection_manager, collection_path: str,
+                 page_size: int = 50, cache_pages: int = 20):
+        self.collection_manager = collection_manager
+        self.collection_path = collection_path
+        self.page_size = max(1, page_size)
+        self.cache_pages = max(1, cache_pages)
+        
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="document-pager")
+        # Document ID to start after for each known page; page 0 starts at the beginning
+        self._cursors: Dict[int, Optional[str]] = {0: None}
+        self._pages: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+        self._fetches: Dict[int, Future] = {}
+        self._last_page: Optional[int] = None
+    
+    def get_page(self, index: int) -> Future:
+        """
+        Get a page of documents, from the cache if possible
+        
+        Args:
+            index: Zero-based page number; must not be past a known page
+            
+        Returns:
+            Future resolving to a list of {'id', 'data'} dictionaries
+        """
+        with self._lock:
+            if index in self._pages:
+                self._pages.move_to_end(index)
+                future = Future()
+                future.set_result(self._pages[index])
+                return future
+            
+            if index in self._fetches:
+                return self._fetches[index]
+            
+            if index not in self._cursors:
+                raise IndexError(f"Page {index} is not reachable yet")
+            
+            future = self._executor.submit(self._fetch_page, index, self._cursors[index])
+            self._fetches[index] = future
+            return future
+    
+    def prefetch(self, index: int):
+        """Start fetching a page in the background if it exists and is not cached"""
+        with self._lock:
+            if index not in self._cursors:
+                return
+        self.get_page(index)
+    
+    def has_next(self, index: int) -> bool:
+        """Whether a page may exist after the given one"""
+        with self._lock:
+            return self._last_page is None or index < self._last_page
+    
+    def _fetch_page(self, index: int, start_after: Optional[str]) -> List[Dict[str, Any]]:
+        """Fetch one page from Firestore and cache it"""
+        try:
+            documents = self.collection_manager.get_documents_page(
+                self.collection_path, self.page_size, start_after
+            )
+        finally:
+            with self._lock:
+                self._fetches.pop(index, None)
+        
+        with self._lock:
+            if len(documents) == self.page_size:
+                self._cursors[index + 1] = documents[-1]['id']
+            else:
+                self._last_page = index
+            
+            self._pages[index] = documents
+            self._pages.move_to_end(index)
+            while len(self._pages) > self.cache_pages:
+                self._pages.popitem(last=False)
+        
+        return documents
+    
+    def close(self):
+        """Stop background fetches"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,16 +1,20 @@
 """
 Firebase connection and management utilities
 """
-import firebase_admin
-from firebase_admin import credentials, firestore
-from typing import Optional
+import sys
+from typing import TYPE_CHECKING, Optional
+
+# firebase_admin pulls in grpc and google-cloud; it is imported on connect
+# so the application window appears without waiting for it
+if TYPE_CHECKING:
+    from google.cloud import firestore
 
 
 class FirebaseManager:
     """Manages Firebase connection and operations"""
     
     def __init__(self):
-        self.db: Optional[firestore.Client] = None
+        self.db: Optional["firestore.Client"] = None
         self.cred_path: Optional[str] = None
     
     def connect(self, credential_path: str) -> bool:
@@ -24,6 +28,9 @@ class FirebaseManager:
             bool: True if connection successful, False otherwise
         """
         try:
+            import firebase_admin
+            from firebase_admin import credentials, firestore
+            
             # Clear previous connection
             if firebase_admin._apps:
                 firebase_admin.delete_app(firebase_admin.get_app())
@@ -44,13 +51,15 @@ class FirebaseManager:
         """Check if Firebase is connected"""
         return self.db is not None
     
-    def get_client(self) -> Optional[firestore.Client]:
+    def get_client(self) -> Optional["firestore.Client"]:
         """Get Firestore client"""
         return self.db
     
     def disconnect(self):
         """Disconnect from Firebase"""
-        if firebase_admin._apps:
+        # Nothing to clean up if firebase_admin was never imported
+        firebase_admin = sys.modules.get("firebase_admin")
+        if firebase_admin and firebase_admin._apps:
             firebase_admin.delete_app(firebase_admin.get_app())
         self.db = None
         self.cred_path = None
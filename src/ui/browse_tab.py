@@ -2,19 +2,46 @@
 Browse Collections tab UI components
 """
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
-import json
-import threading
-from typing import Optional
+from tkinter import ttk, filedialog, messagebox
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+
+from firebase.columnar_writer import COLUMNAR_FORMATS, export_format, pyarrow_available
+from utils.jobs import Job
+from ui.document_browser import DocumentBrowser
+from ui.fields import read_number
+from ui.job_controls import JobControls
+
+
+# Documents fetched per "Load more" step when a collection is expanded
+DOCUMENT_PAGE_SIZE = 100
+
+# Suffixes of the iids of helper items in the tree
+PLACEHOLDER = "::placeholder"
+LOAD_MORE = "::more"
 
 
 class BrowseTab:
     """Browse Collections tab UI and functionality"""
     
-    def __init__(self, parent, firebase_manager, collection_manager):
+    def __init__(self, parent, firebase_manager, collection_manager, dispatcher, job_manager):
         self.parent = parent
         self.firebase_manager = firebase_manager
         self.collection_manager = collection_manager
+        self.dispatcher = dispatcher
+        self.job_manager = job_manager
+        
+        # Variables
+        self.workers_var = tk.StringVar(value="8")
+        self.recursive_delete_var = tk.BooleanVar(value=True)
+        
+        # Lazy loading state
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._generation = 0
+        self._loading: Set[str] = set()
+        self._document_iterators: Dict[str, Iterator[Any]] = {}
         
         self.setup_ui()
     
@@ -27,8 +54,12 @@ class BrowseTab:
         ttk.Button(refresh_frame, text="Refresh Collections", 
                   command=self.refresh_collections).grid(row=0, column=0, padx=(0, 10))
         
+        ttk.Label(refresh_frame, text="Parallel Requests:").grid(row=0, column=1, padx=(10, 0))
+        ttk.Spinbox(refresh_frame, from_=1, to=64, textvariable=self.workers_var, 
+                   width=5).grid(row=0, column=2, padx=(5, 0))
+        
         self.collection_count_label = ttk.Label(refresh_frame, text="")
-        self.collection_count_label.grid(row=0, column=1, padx=(10, 0))
+        self.collection_count_label.grid(row=0, column=3, padx=(10, 0))
         
         # Collections tree
         collections_frame = ttk.LabelFrame(self.parent, text="Collections & Documents", padding="10")
@@ -49,6 +80,9 @@ class BrowseTab:
         self.collections_tree.column("Count", width=80)
         self.collections_tree.column("Last Modified", width=150)
         
+        self.collections_tree.bind("<<TreeviewOpen>>", self._on_tree_open)
+        self.collections_tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        
         # Scrollbars
         v_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.collections_tree.yview)
         h_scrollbar = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.collections_tree.xview)
@@ -64,10 +98,15 @@ class BrowseTab:
         
         ttk.Button(action_frame, text="View Details", 
                   command=self.view_collection_details).grid(row=0, column=0, padx=(0, 10))
-        ttk.Button(action_frame, text="Export to CSV", 
+        ttk.Button(action_frame, text="Export...", 
                   command=self.export_collection).grid(row=0, column=1, padx=(0, 10))
         ttk.Button(action_frame, text="Delete Collection", 
                   command=self.delete_collection).grid(row=0, column=2, padx=(0, 10))
+        ttk.Checkbutton(action_frame, text="Include sub-collections",
+                       variable=self.recursive_delete_var).grid(row=0, column=3, padx=(0, 10))
+        
+        self.job_controls = JobControls(action_frame)
+        self.job_controls.grid(row=0, column=4)
         
         # Status label
         self.status_label_browse = ttk.Label(collections_frame, text="Ready - Click 'Refresh Collections' to load data")
@@ -86,204 +125,302 @@ class BrowseTab:
         if not self.firebase_manager.is_connected():
             messagebox.showerror("Error", "Please connect to Firebase first!")
             return
+        workers = read_number(self.workers_var, "Parallel Requests")
+        if workers is None:
+            return
+        
+        self.collection_manager.db = self.firebase_manager.get_client()
+        
+        # Drop fetches of the previous tree: queued ones are cancelled and
+        # results of running ones are ignored via the generation counter
+        self._generation += 1
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix="browse")
+        self._loading.clear()
+        self._document_iterators.clear()
+        
+        # Clear existing items
+        for item in self.collections_tree.get_children():
+            self.collections_tree.delete(item)
         
         self.status_label_browse.config(text="Loading collections...")
-        thread = threading.Thread(target=self._load_collections)
-        thread.daemon = True
-        thread.start()
+        self._fetch(partial(self._show_collections, ""), self.collection_manager.list_collections)
     
-    def _load_collections(self):
-        """Load collections from Firestore"""
-        try:
-            self.collection_manager.db = self.firebase_manager.get_client()
-            
-            # Clear existing items
-            for item in self.collections_tree.get_children():
-                self.collections_tree.delete(item)
-            
-            # Get collections info
-            collections_info = self.collection_manager.get_all_collections()
-            
-            # Group by main collections
-            main_collections = {}
-            sub_collections = {}
-            
-            for info in collections_info:
-                if info['type'] == 'Collection':
-                    main_collections[info['name']] = info
-                else:
-                    parent = info.get('parent', '')
-                    if parent not in sub_collections:
-                        sub_collections[parent] = []
-                    sub_collections[parent].append(info)
-            
-            # Add to tree
-            for collection_name, collection_info in main_collections.items():
-                collection_item = self.collections_tree.insert(
-                    "", "end", 
-                    text=collection_name,
-                    values=(collection_info['type'], collection_info['count'], collection_info['last_modified'])
-                )
-                
-                # Add sub-collections
-                if collection_name in sub_collections:
-                    for sub_info in sub_collections[collection_name]:
-                        self.collections_tree.insert(
-                            collection_item, "end",
-                            text=sub_info['name'],
-                            values=(sub_info['type'], sub_info['count'], sub_info['last_modified'])
-                        )
-            
-            self.collection_count_label.config(text=f"Found {len(main_collections)} collections")
-            self.status_label_browse.config(text="Collections loaded successfully.")
+    def _fetch(self, on_done: Callable[[Any], None], fn: Callable, *args, key: Optional[Any] = None):
+        """
+        Run a Firestore request in the background and hand its result to
+        on_done, which is called on the Tk thread
+        """
+        generation = self._generation
+        
+        def done(future):
+            if future.cancelled() or generation != self._generation:
+                return  # Stale result from before the last refresh
+            try:
+                result = future.result()
+            except Exception as e:
+                self.set_status(f"Error: {str(e)}")
+                return
+            on_done(result)
+        
+        self._executor.submit(fn, *args).add_done_callback(
+            lambda future: self.dispatcher.post(done, future, key=key)
+        )
+    
+    def set_status(self, text: str):
+        """Show a message in the browse status line"""
+        self.status_label_browse.config(text=text)
+    
+    def _show_collections(self, parent: str, collections_info):
+        """Insert fetched collections under a document (or the root)"""
+        self._clear_placeholder(parent)
+        
+        for info in collections_info:
+            self.collections_tree.insert(parent, "end", iid=info['path'], text=info['name'],
+                                         values=(info['type'], "...", ""))
+            self._add_placeholder(info['path'])
             
-        except Exception as e:
-            error_msg = str(e)
-            self.status_label_browse.config(text=f"Error: {error_msg}")
-            messagebox.showerror("Loading Error", error_msg)
+            # Statistics fill in after the tree is shown
+            self._fetch(partial(self._show_stats, info['path']),
+                        self.collection_manager.get_collection_stats, info['path'],
+                        key=("stats", info['path']))
+        
+        if not parent:
+            self.collection_count_label.config(text=f"Found {len(collections_info)} collections")
+            self.status_label_browse.config(text="Collections loaded. Expand a collection to browse it.")
     
-    def view_collection_details(self):
-        """View details of selected collection"""
+    def _show_stats(self, path: str, stats):
+        """Fill in the statistics columns of a collection"""
+        if self.collections_tree.exists(path):
+            item_type = self.collections_tree.set(path, "Type")
+            self.collections_tree.item(path, values=(item_type, stats['count'], stats['last_modified']))
+    
+    def _show_documents(self, collection_path: str, doc_ids):
+        """Append a page of documents to a collection"""
+        self._clear_placeholder(collection_path)
+        
+        more_item = collection_path + LOAD_MORE
+        if self.collections_tree.exists(more_item):
+            self.collections_tree.delete(more_item)
+        
+        for doc_id in doc_ids:
+            doc_path = f"{collection_path}/{doc_id}"
+            self.collections_tree.insert(collection_path, "end", iid=doc_path, text=doc_id,
+                                         values=("Document", "", ""))
+            self._add_placeholder(doc_path)
+        
+        # A full page means there may be more documents to fetch
+        if len(doc_ids) == DOCUMENT_PAGE_SIZE:
+            self.collections_tree.insert(collection_path, "end", iid=more_item,
+                                         text="Load more documents...", values=("", "", ""))
+    
+    def _next_document_page(self, collection_path: str):
+        """Fetch the next page of document IDs from a collection's iterator"""
+        iterator = self._document_iterators[collection_path]
+        return [doc_ref.id for doc_ref in islice(iterator, DOCUMENT_PAGE_SIZE)]
+    
+    def _add_placeholder(self, item: str):
+        """Give an item a dummy child so it can be expanded"""
+        self.collections_tree.insert(item, "end", iid=item + PLACEHOLDER, text="Loading...")
+    
+    def _clear_placeholder(self, item: str):
+        """Remove an item's dummy child once its real children arrived"""
+        self._loading.discard(item)
+        if self.collections_tree.exists(item + PLACEHOLDER):
+            self.collections_tree.delete(item + PLACEHOLDER)
+    
+    def _on_tree_open(self, event):
+        """Fetch children of an item the first time it is expanded"""
+        item = self.collections_tree.focus()
+        if not self.collections_tree.exists(item + PLACEHOLDER) or item in self._loading:
+            return
+        
+        self._loading.add(item)
+        if self._is_collection(item):
+            # Documents are paged from a lazy iterator kept per collection
+            self._document_iterators[item] = self.collection_manager.iter_document_refs(
+                item, DOCUMENT_PAGE_SIZE
+            )
+            self._fetch(partial(self._show_documents, item), self._next_document_page, item)
+        else:
+            self._fetch(partial(self._show_collections, item), self.collection_manager.list_collections, item)
+    
+    def _on_tree_select(self, event):
+        """Fetch the next page when the "Load more" item is selected"""
         selection = self.collections_tree.selection()
-        if not selection:
-            messagebox.showwarning("Warning", "Please select a collection first!")
+        if not selection or not selection[0].endswith(LOAD_MORE):
             return
         
-        item = selection[0]
-        collection_name = self.collections_tree.item(item)['text']
+        collection_path = selection[0][:-len(LOAD_MORE)]
+        if collection_path in self._loading:
+            return
+        
+        self._loading.add(collection_path)
+        self.collections_tree.item(selection[0], text="Loading...")
+        self._fetch(partial(self._show_documents, collection_path), self._next_document_page, collection_path)
+    
+    def _is_collection(self, item: str) -> bool:
+        """Collection paths have an odd number of segments"""
+        return item.count("/") % 2 == 0
+    
+    def _selected_collection(self) -> Optional[str]:
+        """Return the selected collection path, warning if none is selected"""
+        selection = self.collections_tree.selection()
+        if not selection or not self._is_collection(selection[0]) or "::" in selection[0]:
+            messagebox.showwarning("Warning", "Please select a collection first!")
+            return None
+        
+        # Tree items are keyed by their full collection path
+        return selection[0]
+    
+    def view_collection_details(self):
+        """View details of selected collection"""
+        collection_name = self._selected_collection()
+        if not collection_name:
+            return
         
         try:
-            # Create details window
-            details_window = tk.Toplevel(self.parent)
-            details_window.title(f"Collection Details: {collection_name}")
-            details_window.geometry("600x400")
-            
-            # Collection info
-            info_frame = ttk.LabelFrame(details_window, text="Collection Information", padding="10")
-            info_frame.pack(fill="x", padx=10, pady=5)
-            
-            ttk.Label(info_frame, text=f"Name: {collection_name}").pack(anchor="w")
-            
-            # Sample documents
-            docs_frame = ttk.LabelFrame(details_window, text="Sample Documents", padding="10")
-            docs_frame.pack(fill="both", expand=True, padx=10, pady=5)
-            
-            docs_text = scrolledtext.ScrolledText(docs_frame, height=15, width=70)
-            docs_text.pack(fill="both", expand=True)
-            
-            # Load documents in thread
-            def load_documents():
-                try:
-                    self.collection_manager.db = self.firebase_manager.get_client()
-                    documents = self.collection_manager.get_collection_documents(collection_name, 5)
-                    
-                    if documents:
-                        docs_text.insert(tk.END, f"Showing first {len(documents)} documents:\n\n")
-                        for i, doc in enumerate(documents, 1):
-                            docs_text.insert(tk.END, f"Document {i} (ID: {doc['id']}):\n")
-                            docs_text.insert(tk.END, json.dumps(doc['data'], indent=2, default=str))
-                            docs_text.insert(tk.END, "\n" + "="*50 + "\n\n")
-                    else:
-                        docs_text.insert(tk.END, "No documents found in this collection.")
-                        
-                except Exception as e:
-                    docs_text.insert(tk.END, f"Error loading documents: {str(e)}")
-                
-                docs_text.config(state=tk.DISABLED)
-            
-            thread = threading.Thread(target=load_documents)
-            thread.daemon = True
-            thread.start()
+            self.collection_manager.db = self.firebase_manager.get_client()
+            DocumentBrowser(self.parent, self.collection_manager, collection_name, self.dispatcher)
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load collection details: {str(e)}")
     
     def export_collection(self):
-        """Export collection to CSV"""
-        selection = self.collections_tree.selection()
-        if not selection:
-            messagebox.showwarning("Warning", "Please select a collection first!")
+        """Export collection to a CSV, Parquet or Arrow file"""
+        collection_name = self._selected_collection()
+        if not collection_name:
+            return
+        partitions = read_number(self.workers_var, "Parallel Requests")
+        if partitions is None:
             return
         
-        item = selection[0]
-        collection_name = self.collections_tree.item(item)['text']
-        
-        # Ask for save location
+        # Ask for save location; the format follows the file extension
         file_path = filedialog.asksaveasfilename(
-            title="Save CSV File",
+            title="Export Collection",
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-            initialvalue=f"{collection_name.replace('/', '_')}.csv"
+            filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet"),
+                       ("Arrow IPC files", "*.arrow *.feather"), ("All files", "*.*")],
+            initialfile=f"{collection_name.replace('/', '_')}.csv"
         )
         
         if not file_path:
             return
         
+        if export_format(file_path) in COLUMNAR_FORMATS and not pyarrow_available():
+            messagebox.showerror("Export Error",
+                                 "Parquet and Arrow exports require pyarrow.\n\npip install pyarrow")
+            return
+        
         self.status_label_browse.config(text="Exporting...")
-        thread = threading.Thread(target=self._export_collection, args=(collection_name, file_path))
-        thread.daemon = True
-        thread.start()
+        job = self.job_manager.start("export", self._export_collection,
+                                     collection_name, file_path, partitions)
+        self.job_controls.attach(job)
     
-    def _export_collection(self, collection_name: str, file_path: str):
-        """Export collection to CSV file"""
+    def _export_collection(self, job: Job, collection_name: str, file_path: str, partitions: int = 1):
+        """Export collection to file (runs as a background job)"""
+        post = self.dispatcher.post
+        
         try:
             self.collection_manager.db = self.firebase_manager.get_client()
             
-            success = self.collection_manager.export_collection_to_csv(collection_name, file_path)
+            def progress(count):
+                post(self.set_status, f"Exporting... {count} documents written", key="browse-status")
+            
+            success = self.collection_manager.export_collection(
+                collection_name, file_path, progress_callback=progress,
+                partitions=partitions, job=job
+            )
             
-            if success:
-                self.status_label_browse.config(text="Export completed successfully.")
-                messagebox.showinfo("Success", f"Collection exported to {file_path}")
+            if job.cancelled:
+                post(self.set_status, "Export cancelled.", key="browse-status")
+            elif success:
+                post(self.set_status, "Export completed successfully.", key="browse-status")
+                post(messagebox.showinfo, "Success", f"Collection exported to {file_path}")
             else:
-                self.status_label_browse.config(text="Export failed - no documents found.")
-                messagebox.showinfo("Info", "No documents found in this collection.")
+                post(self.set_status, "Nothing exported - no documents found.", key="browse-status")
+                post(messagebox.showinfo, "Info", "No documents found in this collection.")
             
         except Exception as e:
             error_msg = str(e)
-            self.status_label_browse.config(text=f"Export error: {error_msg}")
-            messagebox.showerror("Export Error", error_msg)
+            post(self.set_status, f"Export error: {error_msg}", key="browse-status")
+            post(messagebox.showerror, "Export Error", error_msg)
+        
+        finally:
+            post(self.job_controls.detach, job)
     
     def delete_collection(self):
         """Delete selected collection"""
-        selection = self.collections_tree.selection()
-        if not selection:
-            messagebox.showwarning("Warning", "Please select a collection first!")
+        collection_name = self._selected_collection()
+        if not collection_name:
+            return
+        max_in_flight = read_number(self.workers_var, "Parallel Requests")
+        if max_in_flight is None:
             return
-        
-        item = selection[0]
-        collection_name = self.collections_tree.item(item)['text']
         
         # Confirmation
+        scope = " and all of its sub-collections" if self.recursive_delete_var.get() else ""
         result = messagebox.askyesno(
             "Confirm Deletion",
-            f"Are you sure you want to delete the collection '{collection_name}'?\n\nThis action cannot be undone!"
+            f"Are you sure you want to delete the collection '{collection_name}'{scope}?\n\nThis action cannot be undone!"
         )
         
         if not result:
             return
         
         self.status_label_browse.config(text="Deleting...")
-        thread = threading.Thread(target=self._delete_collection, args=(collection_name,))
-        thread.daemon = True
-        thread.start()
+        recursive = self.recursive_delete_var.get()
+        job = self.job_manager.start("delete", self._delete_collection,
+                                     collection_name, max_in_flight, recursive)
+        self.job_controls.attach(job)
     
-    def _delete_collection(self, collection_name: str):
-        """Delete collection from Firestore"""
+    def _delete_collection(self, job: Job, collection_name: str, max_in_flight: int = 4,
+                           recursive: bool = False):
+        """Delete collection from Firestore (runs as a background job)"""
+        post = self.dispatcher.post
+        
         try:
             self.collection_manager.db = self.firebase_manager.get_client()
             
-            success = self.collection_manager.delete_collection(collection_name)
+            current_rate = 0.0
+            deleted_count = 0
+            
+            def progress(deleted, rate):
+                nonlocal current_rate, deleted_count
+                current_rate, deleted_count = rate, deleted
+                if not recursive:
+                    post(self.set_status, f"Deleting... {deleted} documents ({rate:.0f} docs/s)",
+                         key="browse-status")
+            
+            def level_status(message):
+                # Per-level progress of a recursive delete
+                post(self.set_status, f"{message} ({current_rate:.0f} docs/s)", key="browse-status")
             
-            if success:
-                self.status_label_browse.config(text="Collection deleted successfully.")
-                messagebox.showinfo("Success", f"Collection '{collection_name}' deleted successfully!")
+            success = self.collection_manager.delete_collection(
+                collection_name, max_in_flight=max_in_flight, recursive=recursive,
+                progress_callback=progress, status_callback=level_status,
+                max_workers=max_in_flight, job=job
+            )
+            
+            if job.cancelled:
+                post(self.set_status, f"Delete cancelled after {deleted_count} documents.",
+                     key="browse-status")
+                post(self.refresh_collections)
+            elif success:
+                post(self.set_status, "Collection deleted successfully.", key="browse-status")
+                post(messagebox.showinfo, "Success", f"Collection '{collection_name}' deleted successfully!")
                 # Refresh the collection list
-                self.refresh_collections()
+                post(self.refresh_collections)
             else:
-                self.status_label_browse.config(text="Delete failed.")
-                messagebox.showerror("Error", "Failed to delete collection")
+                post(self.set_status, "Delete failed.", key="browse-status")
+                post(messagebox.showerror, "Error", "Failed to delete collection")
             
         except Exception as e:
             error_msg = str(e)
-            self.status_label_browse.config(text=f"Delete error: {error_msg}")
-            messagebox.showerror("Delete Error", error_msg)
+            post(self.set_status, f"Delete error: {error_msg}", key="browse-status")
+            post(messagebox.showerror, "Delete Error", error_msg)
+        
+        finally:
+            post(self.job_controls.detach, job)
@@ -0,0 +1,83 @@
+"""
+Thread-safe UI updates: worker threads post events, the Tk thread runs them
+"""
+import itertools
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class UIDispatcher:
+    """
+    Runs callbacks posted from worker threads on the Tk main loop
+    
+    Events are queued under a lock and drained with root.after at a fixed
+    frame rate. An event posted with a key replaces a pending event with the
+    same key, so a worker reporting progress once per batch costs at most
+    one widget update per frame however fast the batches go. Each frame
+    runs events for at most a fraction of the frame interval; the rest wait
+    for the next frame, so large bursts (e.g. thousands of tree inserts)
+    never freeze the window.
+    """
+    
+    def __init__(self, root, fps: int = 30, frame_budget: float = 0.6):
+        self.root = root
+        self.interval_ms = max(1, round(1000 / fps))
+        self.budget = self.interval_ms / 1000 * frame_budget
+        self._pending: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._after_id: Optional[str] = self.root.after(self.interval_ms, self._drain)
+    
+    def post(self, callback: Callable, *args: Any, key: Optional[Hashable] = None, **kwargs: Any):
+        """
+        Queue a callback to run on the Tk thread
+        
+        Args:
+            callback: Function to call, usually a widget method
+            *args: Positional arguments for the callback
+            key: Coalescing key; a pending event with the same key is dropped
+                in favour of this one. Events without a key always run.
+            **kwargs: Keyword arguments for the callback
+        """
+        with self._lock:
+            if key is None:
+                key = ("event", next(self._sequence))
+            else:
+                # Keep the newest event, in the position of the newest post
+                self._pending.pop(key, None)
+            self._pending[key] = (callback, args, kwargs)
+    
+    def wrap(self, callback: Callable, key: Optional[Hashable] = None) -> Callable:
+        """Return a function that posts callback with its arguments, for use as a worker callback"""
+        def posted(*args: Any, **kwargs: Any):
+            self.post(callback, *args, key=key, **kwargs)
+        return posted
+    
+    def _drain(self):
+        """Run pending events until the frame budget is spent"""
+        started = time.perf_counter()
+        
+        while time.perf_counter() - started < self.budget:
+            with self._lock:
+                if not self._pending:
+                    break
+                _, (callback, args, kwargs) = self._pending.popitem(last=False)
+            
+            try:
+                callback(*args, **kwargs)
+            except Exception:
+                # Same reporting as exceptions raised in Tk event handlers
+                self.root.report_callback_exception(*sys.exc_info())
+        
+        self._after_id = self.root.after(self.interval_ms, self._drain)
+    
+    def close(self):
+        """Stop draining events; pending events are dropped"""
+        if self._after_id:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        with self._lock:
+            self._pending.clear()
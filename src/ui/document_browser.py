@@ -0,0 +1,172 @@
+"""
+Paged document browser window
+"""
+import tkinter as tk
+from tkinter import ttk, scrolledtext
+import json
+from typing import Any, Dict, List, Optional
+
+from firebase.document_pager import DocumentPager
+from ui.fields import read_number
+
+
+class DocumentBrowser:
+    """Document grid for one collection, paged with Firestore cursors"""
+    
+    def __init__(self, parent, collection_manager, collection_path: str, dispatcher, page_size: int = 50):
+        self.collection_manager = collection_manager
+        self.collection_path = collection_path
+        self.dispatcher = dispatcher
+        
+        # Variables
+        self.page_size_var = tk.StringVar(value=str(page_size))
+        self.page_index = 0
+        self.pager: Optional[DocumentPager] = None
+        self.documents: List[Dict[str, Any]] = []
+        
+        self.window = tk.Toplevel(parent)
+        self.window.title(f"Collection Details: {collection_path}")
+        self.window.geometry("900x600")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.setup_ui()
+        self.reset_pager()
+    
+    def setup_ui(self):
+        """Setup the document browser UI"""
+        # Paging controls
+        controls_frame = ttk.Frame(self.window, padding="10")
+        controls_frame.pack(fill="x")
+        
+        ttk.Label(controls_frame, text=f"Collection: {self.collection_path}").grid(row=0, column=0, padx=(0, 20))
+        
+        self.prev_button = ttk.Button(controls_frame, text="< Previous", 
+                                     command=lambda: self.show_page(self.page_index - 1), state="disabled")
+        self.prev_button.grid(row=0, column=1, padx=(0, 5))
+        
+        self.page_label = ttk.Label(controls_frame, text="")
+        self.page_label.grid(row=0, column=2, padx=(5, 5))
+        
+        self.next_button = ttk.Button(controls_frame, text="Next >", 
+                                     command=lambda: self.show_page(self.page_index + 1), state="disabled")
+        self.next_button.grid(row=0, column=3, padx=(5, 20))
+        
+        ttk.Label(controls_frame, text="Page Size:").grid(row=0, column=4)
+        page_size_spinbox = ttk.Spinbox(controls_frame, from_=10, to=500, increment=10, 
+                                       textvariable=self.page_size_var, width=6, command=self.reset_pager)
+        page_size_spinbox.grid(row=0, column=5, padx=(5, 0))
+        page_size_spinbox.bind('<Return>', lambda event: self.reset_pager())
+        
+        # Documents grid
+        grid_frame = ttk.LabelFrame(self.window, text="Documents", padding="10")
+        grid_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        
+        self.documents_tree = ttk.Treeview(grid_frame, show="headings")
+        v_scrollbar = ttk.Scrollbar(grid_frame, orient="vertical", command=self.documents_tree.yview)
+        h_scrollbar = ttk.Scrollbar(grid_frame, orient="horizontal", command=self.documents_tree.xview)
+        self.documents_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        
+        self.documents_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        h_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        grid_frame.columnconfigure(0, weight=1)
+        grid_frame.rowconfigure(0, weight=1)
+        
+        self.documents_tree.bind("<<TreeviewSelect>>", self.show_document)
+        
+        # Selected document
+        doc_frame = ttk.LabelFrame(self.window, text="Selected Document", padding="10")
+        doc_frame.pack(fill="x", padx=10, pady=5)
+        
+        self.doc_text = scrolledtext.ScrolledText(doc_frame, height=8, width=70)
+        self.doc_text.pack(fill="both", expand=True)
+        
+        self.status_label = ttk.Label(self.window, text="")
+        self.status_label.pack(anchor="w", padx=10, pady=(0, 10))
+    
+    def reset_pager(self):
+        """Start paging from the first page with the current page size"""
+        page_size = read_number(self.page_size_var, "Page size")
+        if page_size is None:
+            return
+        
+        if self.pager:
+            self.pager.close()
+        
+        self.pager = DocumentPager(self.collection_manager, self.collection_path, page_size)
+        self.show_page(0)
+    
+    def show_page(self, index: int):
+        """Show a page, fetching it in the background unless it is cached"""
+        self.page_index = index
+        self.prev_button.config(state="disabled")
+        self.next_button.config(state="disabled")
+        self.status_label.config(text=f"Loading page {index + 1}...")
+        
+        # Pages are fetched on the pager's threads and rendered on the Tk thread
+        pager = self.pager
+        pager.get_page(index).add_done_callback(
+            lambda future: self.dispatcher.post(self._render_page, pager, index, future)
+        )
+    
+    def _render_page(self, pager: DocumentPager, index: int, future):
+        """Fill the grid with a fetched page"""
+        if pager is not self.pager or index != self.page_index:
+            return  # User moved on or closed the window before this page arrived
+        
+        try:
+            self.documents = future.result()
+        except Exception as e:
+            self.status_label.config(text=f"Error loading documents: {str(e)}")
+            self.prev_button.config(state="normal" if index > 0 else "disabled")
+            return
+        
+        # Columns are the union of the fields on this page
+        fields = list(dict.fromkeys(key for doc in self.documents for key in doc['data']))
+        columns = ["ID"] + fields
+        
+        self.documents_tree.delete(*self.documents_tree.get_children())
+        self.documents_tree.configure(columns=columns)
+        for column in columns:
+            self.documents_tree.heading(column, text=column)
+            self.documents_tree.column(column, width=120, stretch=False)
+        
+        for i, doc in enumerate(self.documents):
+            values = [doc['id']] + [self._format_value(doc['data'].get(field)) for field in fields]
+            self.documents_tree.insert("", "end", iid=str(i), values=values)
+        
+        first = index * pager.page_size
+        self.page_label.config(text=f"Page {index + 1}")
+        self.status_label.config(text=f"Showing documents {first + 1 if self.documents else 0}-"
+                                      f"{first + len(self.documents)}")
+        self.prev_button.config(state="normal" if index > 0 else "disabled")
+        
+        if pager.has_next(index):
+            self.next_button.config(state="normal")
+            # Have the next page ready before it is asked for
+            pager.prefetch(index + 1)
+    
+    def _format_value(self, value: Any) -> str:
+        """Short single-line text for a grid cell"""
+        if value is None:
+            return ""
+        text = json.dumps(value, default=str) if isinstance(value, (dict, list)) else str(value)
+        return text if len(text) <= 100 else text[:97] + "..."
+    
+    def show_document(self, event=None):
+        """Show the selected document as JSON"""
+        selection = self.documents_tree.selection()
+        if not selection:
+            return
+        
+        doc = self.documents[int(selection[0])]
+        self.doc_text.delete(1.0, tk.END)
+        self.doc_text.insert(1.0, f"ID: {doc['id']}\n")
+        self.doc_text.insert(tk.END, json.dumps(doc['data'], indent=2, default=str))
+    
+    def close(self):
+        """Close the window and stop background fetches"""
+        if self.pager:
+            self.pager.close()
+            self.pager = None
+        self.window.destroy()
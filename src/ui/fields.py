@@ -0,0 +1,35 @@
+"""
+Reading numeric settings from entry and spinbox variables
+"""
+from tkinter import messagebox
+from typing import Callable, Optional, Union
+
+Number = Union[int, float]
+
+
+def read_number(variable, label: str, minimum: Number = 1, maximum: Optional[Number] = None,
+                number_type: Callable[[str], Number] = int) -> Optional[Number]:
+    """
+    Read a numeric setting, showing an error when it is not a valid number
+    
+    Args:
+        variable: Tk variable bound to the field
+        label: Field name used in the error message
+        minimum: Smallest accepted value
+        maximum: Largest accepted value, if any
+        number_type: int or float
+    
+    Returns:
+        The value, or None when it is invalid
+    """
+    try:
+        value = number_type(str(variable.get()).strip())
+    except ValueError:
+        value = None
+    
+    if value is None or value < minimum or (maximum is not None and value > maximum):
+        kind = "a whole number" if number_type is int else "a number"
+        limits = f"from {minimum} to {maximum}" if maximum is not None else f"of at least {minimum}"
+        messagebox.showerror("Error", f"{label} must be {kind} {limits}!")
+        return None
+    return value
@@ -0,0 +1,70 @@
+"""
+Pause/Resume and Cancel controls for a background job
+"""
+import tkinter as tk
+from tkinter import ttk
+from typing import Optional
+
+from utils.jobs import Job
+
+
+class JobControls:
+    """Buttons controlling the job started from a tab, disabled while none runs"""
+    
+    def __init__(self, parent):
+        self.job: Optional[Job] = None
+        
+        self.frame = ttk.Frame(parent)
+        
+        self.pause_button = ttk.Button(self.frame, text="Pause", command=self.toggle_pause, state="disabled")
+        self.pause_button.grid(row=0, column=0, padx=(0, 5))
+        
+        self.cancel_button = ttk.Button(self.frame, text="Cancel", command=self.cancel, state="disabled")
+        self.cancel_button.grid(row=0, column=1, padx=(0, 5))
+        
+        self.state_label = ttk.Label(self.frame, text="", foreground="gray")
+        self.state_label.grid(row=0, column=2, sticky=tk.W)
+    
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+    
+    def attach(self, job: Job):
+        """Control a newly started job"""
+        self.job = job
+        self.pause_button.config(text="Pause", state="normal")
+        self.cancel_button.config(state="normal")
+        self.state_label.config(text="")
+    
+    def detach(self, job: Job):
+        """Disable the controls once a job has finished"""
+        if job is not self.job:
+            return  # A newer job is being controlled
+        
+        self.job = None
+        self.pause_button.config(text="Pause", state="disabled")
+        self.cancel_button.config(state="disabled")
+        self.state_label.config(text="Cancelled" if job.cancelled else "")
+    
+    def toggle_pause(self):
+        """Pause after the current batch, or resume"""
+        if not self.job:
+            return
+        
+        if self.job.paused:
+            self.job.resume()
+            self.pause_button.config(text="Pause")
+            self.state_label.config(text="")
+        else:
+            self.job.pause()
+            self.pause_button.config(text="Resume")
+            self.state_label.config(text="Paused (batches in flight still complete)")
+    
+    def cancel(self):
+        """Stop after the batches already sent have been committed"""
+        if not self.job:
+            return
+        
+        self.job.cancel()
+        self.pause_button.config(state="disabled")
+        self.cancel_button.config(state="disabled")
+        self.state_label.config(text="Cancelling after in-flight batches...")
@@ -4,23 +4,48 @@ Upload CSV tab UI components
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
-import threading
 from datetime import datetime
-from typing import Optional, Callable
+from typing import Dict, Optional, Callable, Set
+
+from utils.jobs import Job
+from utils.metrics import UploadMetrics, format_eta
+from utils.upload_queue import UploadJob, UploadQueue, expand_sources, target_collection_path
+from ui.fields import read_number
+from ui.job_controls import JobControls
+
+
+# Upload engine labels shown in the batch settings
+ENGINE_LABELS = {
+    "Batch commits": "batch",
+    "BulkWriter (adaptive rate)": "bulk_writer"
+}
 
 
 class UploadTab:
     """Upload CSV tab UI and functionality"""
     
-    def __init__(self, parent, firebase_manager, csv_processor):
+    def __init__(self, parent, firebase_manager, csv_processor, dispatcher, job_manager):
         self.parent = parent
         self.firebase_manager = firebase_manager
         self.csv_processor = csv_processor
+        self.dispatcher = dispatcher
+        self.job_manager = job_manager
         
         # Variables
         self.csv_path: Optional[str] = None
+        self.schema_path: Optional[str] = None
         self.subcol_mode = tk.StringVar(value="manual")
         self.batch_size_var = tk.StringVar(value="500")
+        self.concurrency_var = tk.StringVar(value="4")
+        self.engine_var = tk.StringVar(value="Batch commits")
+        self.hash_ids_var = tk.BooleanVar(value=False)
+        self.delta_var = tk.BooleanVar(value=False)
+        self.parallel_uploads_var = tk.StringVar(value="2")
+        self.write_rate_var = tk.StringVar(value="0")
+        
+        # Upload queue: file path -> queue tree item
+        self.queued_files: Dict[str, str] = {}
+        self.completed_files: Set[str] = set()
         
         self.setup_ui()
     
@@ -80,6 +105,33 @@ class UploadTab:
                                         textvariable=self.batch_size_var, width=10)
         batch_size_spinbox.grid(row=4, column=1, sticky=tk.W, padx=(10, 0), pady=(10, 0))
         
+        ttk.Label(csv_frame, text="Concurrent Batches:").grid(row=5, column=0, sticky=tk.W, pady=(10, 0))
+        concurrency_spinbox = ttk.Spinbox(csv_frame, from_=1, to=32, 
+                                         textvariable=self.concurrency_var, width=10)
+        concurrency_spinbox.grid(row=5, column=1, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        
+        ttk.Label(csv_frame, text="Upload Engine:").grid(row=6, column=0, sticky=tk.W, pady=(10, 0))
+        engine_combobox = ttk.Combobox(csv_frame, textvariable=self.engine_var, 
+                                      values=list(ENGINE_LABELS), state="readonly", width=27)
+        engine_combobox.grid(row=6, column=1, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        
+        ttk.Label(csv_frame, text="Schema File (Optional):").grid(row=7, column=0, sticky=tk.W, pady=(10, 0))
+        self.schema_label = ttk.Label(csv_frame, text="Inferred from first rows")
+        self.schema_label.grid(row=7, column=1, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        
+        ttk.Button(csv_frame, text="Select Schema File", 
+                  command=self.select_schema).grid(row=7, column=2, padx=(10, 0), pady=(10, 0))
+        
+        ttk.Label(csv_frame, text="Document ID Column(s):").grid(row=8, column=0, sticky=tk.W, pady=(10, 0))
+        self.id_columns_entry = ttk.Entry(csv_frame, width=30)
+        self.id_columns_entry.grid(row=8, column=1, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        
+        ttk.Checkbutton(csv_frame, text="Hash row content", 
+                       variable=self.hash_ids_var).grid(row=8, column=2, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        
+        ttk.Checkbutton(csv_frame, text="Delta upload (write only new/changed rows, delete removed rows)", 
+                       variable=self.delta_var).grid(row=9, column=0, columnspan=3, sticky=tk.W, pady=(10, 0))
+        
         # Preview
         preview_frame = ttk.LabelFrame(self.parent, text="CSV Preview", padding="10")
         preview_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
@@ -98,8 +150,61 @@ class UploadTab:
         self.progress = ttk.Progressbar(upload_control_frame, mode='determinate')
         self.progress.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(10, 0))
         
+        self.upload_controls = JobControls(upload_control_frame)
+        self.upload_controls.grid(row=0, column=2, padx=(10, 0))
+        
         self.status_label = ttk.Label(upload_control_frame, text="Ready")
-        self.status_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        self.status_label.grid(row=1, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+        
+        # Live throughput and ETA; stage timings once the upload finishes
+        self.rate_label = ttk.Label(upload_control_frame, text="", foreground="gray")
+        self.rate_label.grid(row=2, column=0, columnspan=3, sticky=tk.W)
+        
+        # Upload Queue
+        queue_frame = ttk.LabelFrame(self.parent, text="Upload Queue (multiple files)", padding="10")
+        queue_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        queue_buttons = ttk.Frame(queue_frame)
+        queue_buttons.grid(row=0, column=0, columnspan=2, sticky=tk.W)
+        
+        ttk.Button(queue_buttons, text="Add Files...", 
+                  command=self.add_queue_files).grid(row=0, column=0, padx=(0, 10))
+        ttk.Button(queue_buttons, text="Add Folder...", 
+                  command=self.add_queue_folder).grid(row=0, column=1, padx=(0, 10))
+        ttk.Button(queue_buttons, text="Clear", 
+                  command=self.clear_queue).grid(row=0, column=2, padx=(0, 10))
+        
+        ttk.Label(queue_buttons, text="Parallel Uploads:").grid(row=0, column=3, padx=(10, 0))
+        ttk.Spinbox(queue_buttons, from_=1, to=16, textvariable=self.parallel_uploads_var, 
+                   width=5).grid(row=0, column=4, padx=(5, 0))
+        
+        ttk.Label(queue_buttons, text="Max Writes/s (0 = no limit):").grid(row=0, column=5, padx=(10, 0))
+        ttk.Spinbox(queue_buttons, from_=0, to=100000, increment=100, textvariable=self.write_rate_var, 
+                   width=8).grid(row=0, column=6, padx=(5, 0))
+        
+        self.queue_tree = ttk.Treeview(queue_frame, columns=("Target", "Status"), 
+                                       show="tree headings", height=5)
+        self.queue_tree.heading("#0", text="File")
+        self.queue_tree.heading("Target", text="Target Collection")
+        self.queue_tree.heading("Status", text="Status")
+        self.queue_tree.column("#0", width=200)
+        self.queue_tree.column("Target", width=200)
+        self.queue_tree.column("Status", width=300)
+        self.queue_tree.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        queue_scrollbar = ttk.Scrollbar(queue_frame, orient="vertical", command=self.queue_tree.yview)
+        self.queue_tree.configure(yscrollcommand=queue_scrollbar.set)
+        queue_scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S), pady=(10, 0))
+        
+        queue_actions = ttk.Frame(queue_frame)
+        queue_actions.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=(10, 0))
+        
+        self.queue_button = ttk.Button(queue_actions, text="Upload Queue to Firestore", 
+                                      command=self.start_queue)
+        self.queue_button.grid(row=0, column=0, padx=(0, 10))
+        
+        self.queue_controls = JobControls(queue_actions)
+        self.queue_controls.grid(row=0, column=1)
         
         # Grid weights
         self.parent.columnconfigure(0, weight=1)
@@ -109,6 +214,7 @@ class UploadTab:
         preview_frame.columnconfigure(0, weight=1)
         preview_frame.rowconfigure(0, weight=1)
         upload_control_frame.columnconfigure(1, weight=1)
+        queue_frame.columnconfigure(0, weight=1)
     
     def select_credentials(self):
         """Select Firebase service account JSON file"""
@@ -136,6 +242,23 @@ class UploadTab:
             self.update_subcol_mode()
             self.check_ready_to_upload()
     
+    def select_schema(self):
+        """Select JSON/YAML file with column type overrides"""
+        file_path = filedialog.askopenfilename(
+            title="Select Schema File",
+            filetypes=[("Schema files", "*.json *.yaml *.yml"), ("All files", "*.*")]
+        )
+        
+        if file_path:
+            try:
+                self.csv_processor.load_schema(file_path)
+            except Exception as e:
+                messagebox.showerror("Schema Error", str(e))
+                return
+            
+            self.schema_path = file_path
+            self.schema_label.config(text=os.path.basename(file_path), foreground="green")
+    
     def update_subcol_mode(self):
         """Update sub-collection field based on mode"""
         mode = self.subcol_mode.get()
@@ -160,6 +283,8 @@ class UploadTab:
             
         else:  # manual
             self.subcollection_entry.config(state="normal")
+        
+        self.update_queue_targets()
     
     def get_final_collection_path(self) -> str:
         """Return final collection path"""
@@ -216,6 +341,10 @@ class UploadTab:
             messagebox.showerror("Error", "Please enter collection name!")
             return
         
+        settings = self.get_upload_settings()
+        if settings is None:
+            return
+        
         final_collection_path = self.get_final_collection_path()
         
         result = messagebox.askyesno(
@@ -223,19 +352,60 @@ class UploadTab:
             f"CSV file will be uploaded to:\n'{final_collection_path}'\n\nDo you want to continue?"
         )
         
-        if result:
-            self.upload_button.config(state="disabled")
-            thread = threading.Thread(target=self.upload_csv, args=(final_collection_path,))
-            thread.daemon = True
-            thread.start()
+        if not result:
+            return
+        
+        # Offer to continue an interrupted upload of the same file
+        resume = False
+        committed_rows = self.csv_processor.get_checkpoint(self.csv_path, final_collection_path)
+        if committed_rows:
+            resume = messagebox.askyesno(
+                "Resume Upload",
+                f"A previous upload of this file stopped after {committed_rows} records.\n\n"
+                "Resume from there? Choose 'No' to upload the whole file again."
+            )
+        
+        self.upload_button.config(state="disabled")
+        job = self.job_manager.start("upload", self.upload_csv, 
+                                     final_collection_path, resume, settings)
+        self.upload_controls.attach(job)
     
-    def upload_csv(self, collection_path: str):
-        """Upload CSV file to Firestore"""
-        def progress_callback(current: int, total: int):
-            self.progress.config(maximum=total, value=current)
+    def get_upload_settings(self) -> Optional[dict]:
+        """
+        Read the batch settings into CSVProcessor.upload_csv arguments
+        
+        Returns None, after showing an error, when a numeric setting is invalid
+        """
+        batch_size = read_number(self.batch_size_var, "Batch Size", maximum=500)
+        if batch_size is None:
+            return None
+        max_in_flight = read_number(self.concurrency_var, "Concurrent Batches")
+        if max_in_flight is None:
+            return None
+        
+        # Comma-separated key columns; empty keeps auto-generated IDs
+        id_columns = [column.strip() for column in self.id_columns_entry.get().split(",") 
+                      if column.strip()]
+        return dict(
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            engine=ENGINE_LABELS[self.engine_var.get()],
+            schema_path=self.schema_path,
+            id_columns=id_columns,
+            hash_ids=self.hash_ids_var.get(),
+            delta=self.delta_var.get()
+        )
+    
+    def upload_csv(self, job: Job, collection_path: str, resume: bool, upload_kwargs: dict):
+        """Upload CSV file to Firestore (runs as a background job)"""
+        post = self.dispatcher.post
+        metrics = UploadMetrics()
         
-        def status_callback(status: str):
-            self.status_label.config(text=status)
+        def show_progress(current: int, total: int):
+            self.progress.config(maximum=total, value=current)
+            self.rate_label.config(text=f"{metrics.rows_per_second():,.0f} rows/s  •  "
+                                        f"{metrics.bytes_per_second() / 1024 / 1024:,.1f} MB/s  •  "
+                                        f"ETA {format_eta(metrics.eta())}")
         
         try:
             self.csv_processor.db = self.firebase_manager.get_client()
@@ -243,19 +413,165 @@ class UploadTab:
             success = self.csv_processor.upload_csv(
                 self.csv_path,
                 collection_path,
-                int(self.batch_size_var.get()),
-                progress_callback,
-                status_callback
+                progress_callback=self.dispatcher.wrap(show_progress, key="upload-progress"),
+                status_callback=self.dispatcher.wrap(self.set_status, key="upload-status"),
+                resume=resume,
+                metrics=metrics,
+                job=job,
+                **upload_kwargs
             )
             
+            post(self.rate_label.config, text=metrics.summary(), key="upload-progress")
+            
             if success:
-                messagebox.showinfo("Success", f"CSV uploaded successfully to '{collection_path}'!")
+                post(messagebox.showinfo, "Success", f"CSV uploaded successfully to '{collection_path}'!")
+            elif not job.cancelled:
+                post(messagebox.showerror, "Upload Error", "Failed to upload CSV file")
+                
+        except Exception as e:
+            post(messagebox.showerror, "Upload Error", str(e))
+        
+        finally:
+            post(self.upload_controls.detach, job)
+            post(self.upload_button.config, state="normal")
+            post(self.progress.config, value=0)
+    
+    def set_status(self, text: str):
+        """Show a message in the upload status line"""
+        self.status_label.config(text=text)
+    
+    def add_queue_files(self):
+        """Add CSV files to the upload queue"""
+        file_paths = filedialog.askopenfilenames(
+            title="Select CSV Files",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        self.queue_files(list(file_paths))
+    
+    def add_queue_folder(self):
+        """Add every CSV file of a folder to the upload queue"""
+        directory = filedialog.askdirectory(title="Select Folder with CSV Files")
+        if directory:
+            self.queue_files([directory])
+    
+    def queue_files(self, sources: list):
+        """Add files, folders or glob patterns to the upload queue"""
+        for file_path in expand_sources(sources):
+            if file_path in self.queued_files:
+                continue
+            self.queued_files[file_path] = self.queue_tree.insert(
+                "", "end", text=os.path.basename(file_path), values=("", "Queued")
+            )
+        self.update_queue_targets()
+    
+    def clear_queue(self):
+        """Remove all files from the upload queue"""
+        self.queue_tree.delete(*self.queue_tree.get_children())
+        self.queued_files.clear()
+        self.completed_files.clear()
+    
+    def update_queue_targets(self):
+        """Show the collection each queued file will be uploaded to"""
+        for file_path, item in self.queued_files.items():
+            self.queue_tree.set(item, "Target", self.get_queue_collection_path(file_path))
+    
+    def get_queue_collection_path(self, file_path: str) -> str:
+        """Return the collection path for a queued file, following the sub-collection mode"""
+        return target_collection_path(
+            file_path,
+            self.collection_entry.get().strip(),
+            self.subcollection_entry.get().strip(),
+            self.subcol_mode.get()
+        )
+    
+    def start_queue(self):
+        """Start uploading every queued file"""
+        if not self.firebase_manager.is_connected():
+            messagebox.showerror("Error", "Please connect to Firebase first!")
+            return
+        if not self.collection_entry.get().strip():
+            messagebox.showerror("Error", "Please enter collection name!")
+            return
+        # Files uploaded by an earlier run of the queue are not uploaded again
+        pending_files = [file_path for file_path in self.queued_files 
+                         if file_path not in self.completed_files]
+        if not pending_files:
+            messagebox.showerror("Error", "Please add CSV files to the queue!")
+            return
+        
+        parallel_uploads = read_number(self.parallel_uploads_var, "Parallel Uploads")
+        if parallel_uploads is None:
+            return
+        if not self.write_rate_var.get().strip():
+            self.write_rate_var.set("0")
+        write_rate = read_number(self.write_rate_var, "Max Writes/s", minimum=0, number_type=float)
+        if write_rate is None:
+            return
+        settings = self.get_upload_settings()
+        if settings is None:
+            return
+        
+        self.update_queue_targets()
+        result = messagebox.askyesno(
+            "Confirmation",
+            f"{len(pending_files)} CSV files will be uploaded, "
+            f"{parallel_uploads} at a time.\n\nDo you want to continue?"
+        )
+        if not result:
+            return
+        
+        queue = UploadQueue(self.csv_processor, parallel_uploads, write_rate or None)
+        for file_path in pending_files:
+            queue.add(file_path, self.get_queue_collection_path(file_path))
+        
+        self.queue_button.config(state="disabled")
+        job = self.job_manager.start("upload-queue", self.upload_queue, queue, settings)
+        self.queue_controls.attach(job)
+    
+    def upload_queue(self, job: Job, queue: UploadQueue, upload_kwargs: dict):
+        """Run the upload queue (runs as a background job)"""
+        post = self.dispatcher.post
+        
+        def job_callback(upload_job: UploadJob):
+            # Only the latest status of each file is drawn
+            post(self.show_job_status, upload_job, key=("queue-job", upload_job.file_path))
+        
+        try:
+            self.csv_processor.db = self.firebase_manager.get_client()
+            
+            jobs = queue.run(job_callback, job=job, **upload_kwargs)
+            
+            self.completed_files.update(upload_job.file_path for upload_job in jobs if upload_job.success)
+            failed = [upload_job for upload_job in jobs if upload_job.success is False]
+            uploaded = sum(1 for upload_job in jobs if upload_job.success)
+            
+            if job.cancelled:
+                post(self.set_status, f"Queue cancelled: {uploaded} uploaded, {len(failed)} failed. "
+                                      "Run the queue again to resume the rest.", key="upload-status")
+                return
+            
+            post(self.set_status, f"Queue finished: {uploaded} uploaded, "
+                                  f"{len(failed)} failed.", key="upload-status")
+            if failed:
+                post(messagebox.showerror, "Upload Error", f"{len(failed)} of {len(jobs)} files failed to upload. "
+                                                           "Run the queue again to resume them.")
             else:
-                messagebox.showerror("Upload Error", "Failed to upload CSV file")
+                post(messagebox.showinfo, "Success", f"{len(jobs)} CSV files uploaded successfully!")
                 
         except Exception as e:
-            messagebox.showerror("Upload Error", str(e))
+            post(messagebox.showerror, "Upload Error", str(e))
         
         finally:
-            self.upload_button.config(state="normal")
-            self.progress.config(value=0)
+            post(self.queue_controls.detach, job)
+            post(self.queue_button.config, state="normal")
+    
+    def show_job_status(self, job: UploadJob):
+        """Show a queued job's status, with its rate and ETA while it uploads"""
+        item = self.queued_files.get(job.file_path)
+        if not item or not self.queue_tree.exists(item):
+            return  # Removed from the queue meanwhile
+        
+        status = job.status
+        if job.metrics and job.success is None and job.uploaded:
+            status += f" ({job.metrics.rows_per_second():,.0f} rows/s, ETA {format_eta(job.metrics.eta())})"
+        self.queue_tree.set(item, "Status", status)
@@ -0,0 +1,235 @@
+"""
+Concurrent Firestore batch commit utilities
+"""
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+
+# Upload engines selectable from the UI
+ENGINES = ("batch", "bulk_writer")
+
+# Most writes Firestore accepts in one batch commit
+MAX_BATCH_SIZE = 500
+
+# gRPC status codes worth retrying: DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED,
+# ABORTED, INTERNAL, UNAVAILABLE
+RETRYABLE_CODES = {4, 8, 10, 13, 14}
+
+# A write is a (document reference, document data) pair; None data deletes
+Write = Tuple[Any, Optional[Dict[str, Any]]]
+
+# Called with (seconds, write count) after every commit or flush
+CommitCallback = Callable[[float, int], None]
+
+
+class BatchCommitter:
+    """Commits write batches on a thread pool with a bounded in-flight window"""
+    
+    def __init__(self, db, max_in_flight: int = 1, on_commit: Optional[CommitCallback] = None):
+        self.db = db
+        self.max_in_flight = max(1, max_in_flight)
+        self.on_commit = on_commit
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight,
+                                            thread_name_prefix="batch-commit")
+        self._pending: Deque[Tuple[Future, Any]] = deque()
+    
+    def submit(self, writes: Sequence[Write], payload: Any = None) -> List[Any]:
+        """
+        Start committing a batch, blocking while the in-flight window is full
+        
+        Args:
+            writes: Document writes that make up the batch
+            payload: Value handed back once the batch is committed
+            
+        Returns:
+            Payloads of the batches committed so far, in submission order
+        """
+        batch = self.db.batch()
+        for doc_ref, doc_data in writes:
+            if doc_data is None:
+                batch.delete(doc_ref)
+            else:
+                batch.set(doc_ref, doc_data)
+        
+        completed = []
+        
+        # Backpressure: wait for the oldest commit while the window is full
+        while len(self._pending) >= self.max_in_flight:
+            completed.append(self._pop_oldest())
+        
+        if writes:
+            future = self._executor.submit(self._commit, batch, len(writes))
+        else:
+            # Nothing to write; keep the payload's place in line
+            future = Future()
+            future.set_result(None)
+        self._pending.append((future, payload))
+        
+        # Collect commits that already finished, keeping submission order
+        while self._pending and self._pending[0][0].done():
+            completed.append(self._pop_oldest())
+        
+        return completed
+    
+    def drain(self) -> List[Any]:
+        """
+        Wait for every in-flight batch to be committed
+        
+        Returns:
+            Payloads of the remaining batches, in submission order
+        """
+        completed = []
+        while self._pending:
+            completed.append(self._pop_oldest())
+        return completed
+    
+    def _commit(self, batch, write_count: int):
+        """Commit a batch on a pool thread, timing it for on_commit"""
+        if not self.on_commit:
+            return batch.commit()
+        
+        started = time.perf_counter()
+        result = batch.commit()
+        self.on_commit(time.perf_counter() - started, write_count)
+        return result
+    
+    def _pop_oldest(self) -> Any:
+        """Wait for the oldest in-flight commit and return its payload"""
+        future, payload = self._pending.popleft()
+        future.result()
+        return payload
+    
+    def close(self, cancel: bool = False):
+        """Shut down the commit pool, optionally dropping queued commits"""
+        self._executor.shutdown(wait=True, cancel_futures=cancel)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(cancel=exc_type is not None)
+        return False
+
+
+class BulkWriterCommitter:
+    """
+    Commits writes through the SDK BulkWriter
+    
+    BulkWriter ramps the write rate up automatically (500 ops/s, +50% every
+    5 minutes) and retries failed writes individually with backoff, so the
+    batch size only controls how often progress is reported.
+    """
+    
+    def __init__(self, db, flush_every: int = 5000, max_retries: int = 10,
+                 max_ops_per_second: Optional[int] = None, on_commit: Optional[CommitCallback] = None):
+        # Imported here so loading this module does not load the Firestore SDK
+        from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriterOptions
+        
+        self.flush_every = max(1, flush_every)
+        self.max_retries = max_retries
+        self.on_commit = on_commit
+        self._bulk_writer = db.bulk_writer(BulkWriterOptions(
+            initial_ops_per_second=500,
+            max_ops_per_second=max_ops_per_second,
+            retry=BulkRetry.exponential
+        ))
+        self._bulk_writer.on_write_error(self._on_write_error)
+        self._pending: List[Any] = []
+        self._unflushed = 0
+        self._failures: List[str] = []
+    
+    def _on_write_error(self, failure, bulk_writer) -> bool:
+        """Retry transient failures until max_retries, record the rest"""
+        if failure.code in RETRYABLE_CODES and failure.attempts < self.max_retries:
+            return True
+        self._failures.append(failure.message)
+        return False
+    
+    def submit(self, writes: Sequence[Write], payload: Any = None) -> List[Any]:
+        """
+        Queue writes on the BulkWriter
+        
+        Args:
+            writes: Document writes to queue
+            payload: Value handed back once the writes are committed
+            
+        Returns:
+            Payloads committed by this call, in submission order
+        """
+        for doc_ref, doc_data in writes:
+            if doc_data is None:
+                self._bulk_writer.delete(doc_ref)
+            else:
+                self._bulk_writer.set(doc_ref, doc_data)
+        
+        self._pending.append(payload)
+        self._unflushed += len(writes)
+        
+        if self._unflushed < self.flush_every:
+            return []
+        return self.drain()
+    
+    def drain(self) -> List[Any]:
+        """
+        Block until every queued write is committed
+        
+        Returns:
+            Payloads of the flushed writes, in submission order
+        """
+        started = time.perf_counter()
+        self._bulk_writer.flush()
+        if self.on_commit and self._unflushed:
+            self.on_commit(time.perf_counter() - started, self._unflushed)
+        
+        if self._failures:
+            raise RuntimeError(
+                f"{len(self._failures)} writes failed after retries: {self._failures[0]}"
+            )
+        
+        completed, self._pending = self._pending, []
+        self._unflushed = 0
+        return completed
+    
+    def close(self, cancel: bool = False):
+        """Flush outstanding writes and release the BulkWriter"""
+        self._bulk_writer.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(cancel=exc_type is not None)
+        return False
+
+
+def check_batch_settings(batch_size: int, max_in_flight: int):
+    """Raise ValueError when batches could not be committed with these settings"""
+    if not 1 <= batch_size <= MAX_BATCH_SIZE:
+        raise ValueError(f"Batch size must be from 1 to {MAX_BATCH_SIZE}, got {batch_size}")
+    if max_in_flight < 1:
+        raise ValueError(f"Concurrent batches must be at least 1, got {max_in_flight}")
+
+
+def create_committer(db, engine: str = "batch", max_in_flight: int = 1,
+                     batch_size: int = 500, on_commit: Optional[CommitCallback] = None):
+    """
+    Create the committer for an upload engine
+    
+    Args:
+        db: Firestore client
+        engine: One of ENGINES
+        max_in_flight: Concurrent batches for the batch engine
+        batch_size: Rows per batch, used to size BulkWriter flushes
+        on_commit: Called with (seconds, write count) after each batch
+            commit, or each BulkWriter flush
+        
+    Returns:
+        BatchCommitter or BulkWriterCommitter
+    """
+    if engine == "batch":
+        return BatchCommitter(db, max_in_flight, on_commit)
+    if engine == "bulk_writer":
+        return BulkWriterCommitter(db, flush_every=batch_size * max(1, max_in_flight), on_commit=on_commit)
+    raise ValueError(f"Unknown upload engine: {engine}")
@@ -0,0 +1,104 @@
+"""
+Upload checkpoint journal utilities
+"""
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of committed upload batches
+    
+    The journal lives next to the CSV file as "<file>.checkpoint". Its first
+    line identifies the source file and target collection; every following
+    line records the byte offset reached after a committed batch, so an
+    interrupted upload can seek straight past the rows already written.
+    """
+    
+    SUFFIX = ".checkpoint"
+    
+    def __init__(self, file_path: str, collection_path: str):
+        self.file_path = file_path
+        self.collection_path = collection_path
+        self.path = file_path + self.SUFFIX
+        self._file = None
+    
+    def _header(self) -> Dict[str, Any]:
+        """Identify the source file and target so stale journals are ignored"""
+        stat = os.stat(self.file_path)
+        return {
+            'source_file': os.path.basename(self.file_path),
+            'source_size': stat.st_size,
+            'source_mtime': stat.st_mtime,
+            'collection_path': self.collection_path
+        }
+    
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the last committed checkpoint
+        
+        Returns:
+            Dictionary with batch, offset and rows, or None if there is no
+            journal for this file and collection
+        """
+        if not os.path.exists(self.path):
+            return None
+        
+        with open(self.path, 'r', encoding='utf-8') as file:
+            lines = file.read().splitlines()
+        
+        try:
+            if not lines or json.loads(lines[0]) != self._header():
+                return None
+        except ValueError:
+            return None
+        
+        for line in reversed(lines[1:]):
+            try:
+                return json.loads(line)
+            except ValueError:
+                # Torn write from a crash; fall back to the previous entry
+                continue
+        
+        return None
+    
+    def open(self, resume: bool = False) -> Tuple[int, int, int]:
+        """
+        Open the journal for writing
+        
+        Args:
+            resume: Continue an existing journal instead of starting over
+            
+        Returns:
+            Tuple of (batches committed, byte offset, rows committed) to resume from
+        """
+        checkpoint = self.load() if resume else None
+        
+        if checkpoint:
+            self._file = open(self.path, 'a', encoding='utf-8')
+            return checkpoint['batch'], checkpoint['offset'], checkpoint['rows']
+        
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._write(self._header())
+        return 0, 0, 0
+    
+    def record(self, batch: int, offset: int, rows: int):
+        """Record that everything up to offset has been committed"""
+        self._write({'batch': batch, 'offset': offset, 'rows': rows})
+    
+    def _write(self, entry: Dict[str, Any]):
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+    
+    def close(self):
+        """Close the journal, keeping it for a later resume"""
+        if self._file:
+            self._file.close()
+            self._file = None
+    
+    def complete(self):
+        """Close and remove the journal after a successful upload"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
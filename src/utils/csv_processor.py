@@ -1,18 +1,35 @@
 """
 CSV processing and uploading utilities
 """
+import codecs
 import csv
+import hashlib
+import itertools
+import json
 import os
+import re
 import threading
 from datetime import datetime
-from typing import List, Dict, Any, Callable, Optional
-from firebase_admin import firestore
+from typing import TYPE_CHECKING, List, Dict, Any, Callable, Iterator, Iterable, Optional, Tuple
+
+from utils.batch_committer import check_batch_settings, create_committer
+from utils.checkpoint import CheckpointJournal
+from utils.delta_index import DeltaIndex
+from utils.jobs import Job, JobCancelled
+from utils.metrics import UploadMetrics
+from utils.rate_limiter import TokenBucket
+
+# numpy, pandas and the Firestore SDK are slow to import; they are loaded on
+# first use so the GUI and CLI start quickly
+if TYPE_CHECKING:
+    import numpy as np
+    from google.cloud import firestore
 
 
 class CSVProcessor:
     """Handles CSV file processing and uploading to Firestore"""
     
-    def __init__(self, db: firestore.Client):
+    def __init__(self, db: Optional["firestore.Client"]):
         self.db = db
     
     def read_csv(self, file_path: str) -> List[Dict[str, Any]]:
@@ -29,6 +46,70 @@ class CSVProcessor:
             reader = csv.DictReader(file)
             return list(reader)
     
+    def iter_csv(self, file_path: str, start_offset: int = 0) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """
+        Stream CSV rows without loading the whole file into memory
+        
+        Args:
+            file_path: Path to CSV file
+            start_offset: Byte offset of the first row to read (0 for the start)
+            
+        Yields:
+            Tuples of (row dictionary, byte offset just past the row)
+        """
+        with open(file_path, 'rb') as file:
+            decoder = codecs.getincrementaldecoder('utf-8-sig')()
+            position = 0
+            
+            def lines() -> Iterator[str]:
+                nonlocal position
+                for raw_line in file:
+                    position += len(raw_line)
+                    yield decoder.decode(raw_line)
+            
+            # csv pulls exactly the lines of one record per row, so the
+            # counter always points at the end of the row just returned
+            reader = csv.DictReader(lines())
+            
+            # Read the header, then skip straight to the requested row
+            if reader.fieldnames is not None and start_offset > position:
+                file.seek(start_offset)
+                position = start_offset
+            
+            for row in reader:
+                yield row, position
+    
+    def estimate_row_count(self, file_path: str, sample_rows: int = 1000) -> int:
+        """
+        Estimate number of data rows from the average size of the first rows
+        
+        Args:
+            file_path: Path to CSV file
+            sample_rows: Number of rows to sample
+            
+        Returns:
+            Estimated row count (exact for files shorter than the sample)
+        """
+        count = 0
+        offset = 0
+        for _, offset in itertools.islice(self.iter_csv(file_path), sample_rows):
+            count += 1
+        
+        if count < sample_rows:
+            return count
+        
+        return max(count, round(count * os.path.getsize(file_path) / offset))
+    
+    def _iter_batches(self, records: Iterable[Tuple[Dict[str, Any], int]],
+                      batch_size: int) -> Iterator[List[Tuple[Dict[str, Any], int]]]:
+        """Group streamed rows into batches of at most batch_size rows"""
+        records = iter(records)
+        while True:
+            batch_rows = list(itertools.islice(records, batch_size))
+            if not batch_rows:
+                return
+            yield batch_rows
+    
     def preview_csv(self, file_path: str, max_rows: int = 5) -> str:
         """
         Generate CSV preview text
@@ -43,16 +124,17 @@ class CSVProcessor:
         try:
             with open(file_path, 'r', encoding='utf-8-sig', newline='') as file:
                 reader = csv.reader(file)
-                rows = list(reader)
+                rows = list(itertools.islice(reader, max_rows + 1))
                 
                 if not rows:
                     return "CSV file is empty!"
                 
                 headers = rows[0]
-                total_rows = len(rows) - 1  # Excluding header
+                total_rows = self.estimate_row_count(file_path)
                 
-                preview = f"Total rows: {total_rows}\n"
-                preview += f"Columns: {headers}\n\n"
+                preview = f"Total rows (estimated): {total_rows}\n"
+                preview += f"Columns: {headers}\n"
+                preview += f"Column types: {self.infer_schema(file_path)}\n\n"
                 preview += f"First {min(max_rows, len(rows)-1)} rows:\n"
                 
                 # Header + first max_rows data rows
@@ -67,6 +149,119 @@ class CSVProcessor:
         except Exception as e:
             return f"Error: {str(e)}"
     
+    def infer_schema(self, file_path: str, sample_rows: int = 1000) -> Dict[str, str]:
+        """
+        Infer column types from the first rows of a CSV file
+        
+        Args:
+            file_path: Path to CSV file
+            sample_rows: Number of rows to sample
+            
+        Returns:
+            Dictionary of column name to one of COLUMN_TYPES
+        """
+        rows = [row for row, _ in itertools.islice(self.iter_csv(file_path), sample_rows)]
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        
+        return {
+            column: _infer_column_type(_distinct_values([row.get(column) for row in rows]))
+            for column in columns
+        }
+    
+    def load_schema(self, schema_path: str) -> Dict[str, str]:
+        """
+        Load column type overrides from a JSON or YAML schema file
+        
+        The file maps column names to one of COLUMN_TYPES, e.g.
+        {"zip_code": "string", "salary": "float"}.
+        
+        Args:
+            schema_path: Path to .json, .yaml or .yml file
+            
+        Returns:
+            Dictionary of column name to column type
+        """
+        with open(schema_path, 'r', encoding='utf-8') as file:
+            if schema_path.lower().endswith(('.yaml', '.yml')):
+                try:
+                    import yaml
+                except ImportError:
+                    raise ValueError("PyYAML is required for YAML schema files (pip install pyyaml)")
+                schema = yaml.safe_load(file)
+            else:
+                schema = json.load(file)
+        
+        if not isinstance(schema, dict):
+            raise ValueError(f"Schema file must map column names to types: {schema_path}")
+        
+        for column, column_type in schema.items():
+            if column_type not in COLUMN_TYPES:
+                raise ValueError(f"Unknown type '{column_type}' for column '{column}' "
+                                 f"(expected one of {', '.join(COLUMN_TYPES)})")
+        
+        return schema
+    
+    def build_converters(self, schema: Dict[str, str]) -> Dict[str, Callable[[List[Any]], List[Any]]]:
+        """
+        Build the per-column converter table applied to every batch
+        
+        Args:
+            schema: Dictionary of column name to column type
+            
+        Returns:
+            Dictionary of column name to converter function
+        """
+        return {column: _build_converter(column_type) for column, column_type in schema.items()}
+    
+    def get_checkpoint(self, file_path: str, collection_path: str) -> Optional[int]:
+        """
+        Get number of rows already committed by an interrupted upload
+        
+        Args:
+            file_path: Path to CSV file
+            collection_path: Firestore collection path
+            
+        Returns:
+            Committed row count, or None if there is nothing to resume
+        """
+        checkpoint = CheckpointJournal(file_path, collection_path).load()
+        return checkpoint['rows'] if checkpoint else None
+    
+    def make_document_id(self, row: Dict[str, Any],
+                         id_columns: Optional[List[str]] = None,
+                         hash_ids: bool = False) -> Optional[str]:
+        """
+        Derive a stable document ID from a raw CSV row
+        
+        Args:
+            row: Raw CSV row
+            id_columns: Columns whose values are joined with "_" to form the ID
+            hash_ids: Hash the whole row when no id_columns are given
+            
+        Returns:
+            Document ID, or None to let Firestore generate one
+        """
+        if id_columns:
+            values = [row.get(column) or '' for column in id_columns]
+            if not all(values):
+                raise ValueError(f"Empty document ID column in row: {row}")
+            
+            # "/" would address a sub-collection; "." and ".." are reserved
+            doc_id = "_".join(values).replace("/", "_")
+            if doc_id in (".", "..") or (doc_id.startswith("__") and doc_id.endswith("__")):
+                raise ValueError(f"Invalid document ID: {doc_id}")
+            return doc_id
+        
+        if hash_ids:
+            return self._hash_row(row)
+        
+        return None
+    
+    def _hash_row(self, row: Dict[str, Any]) -> str:
+        """Stable hash of a raw CSV row's content"""
+        content = json.dumps(row, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+    
     def clean_firestore_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Clean data types for Firestore compatibility
@@ -92,6 +287,33 @@ class CSVProcessor:
                 cleaned[key] = str(value)
         return cleaned
     
+    def clean_firestore_records(self, rows: List[Dict[str, Any]],
+                                converters: Optional[Dict[str, Callable[[List[Any]], List[Any]]]] = None
+                                ) -> List[Dict[str, Any]]:
+        """
+        Clean a chunk of rows column by column for Firestore compatibility
+        
+        Each column's type is inferred once over the whole chunk and parsed
+        with vectorized pandas operations instead of per-cell checks.
+        
+        Args:
+            rows: Raw data dictionaries sharing the same columns
+            converters: Per-column converters from build_converters; columns
+                without one are inferred from this chunk
+            
+        Returns:
+            Cleaned data dictionaries, in the same order
+        """
+        if not rows:
+            return []
+        
+        converters = converters or {}
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        column_values = [converters.get(column, _convert_column)([row.get(column) for row in rows])
+                         for column in columns]
+        
+        return [dict(zip(columns, row_values)) for row_values in zip(*column_values)]
+    
     def _is_number(self, s: Any) -> bool:
         """Check if value is a number"""
         try:
@@ -105,7 +327,19 @@ class CSVProcessor:
                    collection_path: str, 
                    batch_size: int = 500,
                    progress_callback: Optional[Callable[[int, int], None]] = None,
-                   status_callback: Optional[Callable[[str], None]] = None) -> bool:
+                   status_callback: Optional[Callable[[str], None]] = None,
+                   max_in_flight: int = 1,
+                   engine: str = "batch",
+                   schema_path: Optional[str] = None,
+                   sample_rows: int = 1000,
+                   resume: bool = False,
+                   id_columns: Optional[List[str]] = None,
+                   hash_ids: bool = False,
+                   delta: bool = False,
+                   index_path: Optional[str] = None,
+                   rate_limiter: Optional[TokenBucket] = None,
+                   metrics: Optional[UploadMetrics] = None,
+                   job: Optional[Job] = None) -> bool:
         """
         Upload CSV file to Firestore
         
@@ -115,46 +349,87 @@ class CSVProcessor:
             batch_size: Number of documents to upload in each batch
             progress_callback: Callback for progress updates (current, total)
             status_callback: Callback for status updates
+            max_in_flight: Number of batches allowed to commit concurrently
+            engine: Upload engine, "batch" or "bulk_writer"
+            schema_path: Optional JSON/YAML file overriding inferred column types
+            sample_rows: Number of rows sampled to infer column types
+            resume: Continue from the checkpoint journal of an interrupted upload
+            id_columns: Columns whose values form the document ID, making re-uploads upserts
+            hash_ids: Use a hash of the row content as document ID when id_columns is not given
+            delta: Only write new or changed rows and delete rows missing from the file,
+                based on a local index of what the previous upload wrote
+            index_path: Delta index database (defaults to ~/.firecsv/delta_index.sqlite3)
+            rate_limiter: Token bucket limiting writes per second, shared between uploads
+            metrics: Collects per-stage timings, commit latencies and throughput
+            job: Pauses or cancels the upload between batches; batches already
+                sent are committed and journaled, so a cancelled upload can be resumed
             
         Returns:
             bool: True if upload successful, False otherwise
+            
+        Raises:
+            ValueError: If batch_size or max_in_flight is out of range
         """
+        check_batch_settings(batch_size, max_in_flight)
+        journal = CheckpointJournal(file_path, collection_path)
+        index = None
+        metrics = metrics or UploadMetrics()
+        
+        if delta and not id_columns:
+            # Delta uploads need stable IDs to match rows between runs
+            hash_ids = True
+        
         try:
             if status_callback:
                 status_callback("Reading CSV file...")
             
-            # Read CSV
-            rows = self.read_csv(file_path)
-            total_rows = len(rows)
+            # Estimate total from file size instead of pre-reading every row
+            total_rows = self.estimate_row_count(file_path)
+            file_size = os.path.getsize(file_path)
+            
+            # Fix column types up front so every batch converts them the same way
+            if status_callback:
+                status_callback("Inferring column types...")
+            schema = self.infer_schema(file_path, sample_rows)
+            if schema_path:
+                schema.update(self.load_schema(schema_path))
+            converters = self.build_converters(schema)
+            
+            missing_columns = [column for column in id_columns or [] if column not in schema]
+            if missing_columns:
+                raise ValueError(f"Document ID columns not found in CSV: {', '.join(missing_columns)}")
             
             # Get collection reference
             collection_ref = self._get_collection_ref(collection_path)
             
-            uploaded = 0
+            batches, start_offset, uploaded = journal.open(resume)
+            resumed = uploaded
+            if uploaded and status_callback:
+                status_callback(f"Resuming after {uploaded} committed records...")
+            
+            if delta:
+                index = DeltaIndex(index_path)
+                target = f"{getattr(self.db, 'project', '')}/{collection_path}"
+                run_id = index.begin(target, resume=bool(uploaded))
+            written = 0
             
-            # Upload in batches
-            for i in range(0, total_rows, batch_size):
-                batch = self.db.batch()
-                batch_data = rows[i:i+batch_size]
+            def report(committed: Tuple[int, int, Optional[List[Tuple[str, str]]]]):
+                nonlocal batches, uploaded, total_rows
+                row_count, offset, index_entries = committed
+                batches += 1
+                uploaded += row_count
+                journal.record(batches, offset, uploaded)
+                if index_entries:
+                    index.mark(target, index_entries, run_id)
                 
-                for row_data in batch_data:
-                    # Clean data for Firestore
-                    doc_data = self.clean_firestore_data(row_data)
-                    
-                    # Add metadata
-                    doc_data['_upload_info'] = {
-                        'uploaded_at': datetime.now(),
-                        'source_file': os.path.basename(file_path),
-                        'collection_path': collection_path
-                    }
-                    
-                    # Document ID (automatic)
-                    doc_ref = collection_ref.document()
-                    batch.set(doc_ref, doc_data)
+                # Refine the estimate from bytes consumed so far
+                if offset < file_size:
+                    total_rows = max(uploaded, round(uploaded * file_size / offset))
+                else:
+                    total_rows = uploaded
                 
-                # Commit batch
-                batch.commit()
-                uploaded += len(batch_data)
+                # Rates cover this run only, not rows committed before a resume
+                metrics.progress(uploaded - resumed, total_rows - resumed, offset - start_offset)
                 
                 # Update progress
                 if progress_callback:
@@ -162,15 +437,149 @@ class CSVProcessor:
                 if status_callback:
                     status_callback(f"Uploading... {uploaded}/{total_rows}")
             
+            # Upload in batches streamed from the file; the committer blocks
+            # the reader while it cannot accept more writes
+            with create_committer(self.db, engine, max_in_flight, batch_size,
+                                  metrics.observe_commit) as committer:
+                cancelled = False
+                records = self.iter_csv(file_path, start_offset)
+                for batch_rows in metrics.timed_iter(self._iter_batches(records, batch_size), "read"):
+                    if job:
+                        with metrics.stage("paused"):
+                            try:
+                                job.checkpoint()
+                            except JobCancelled:
+                                cancelled = True
+                                break
+                    
+                    writes = []
+                    
+                    raw_rows = [row for row, _ in batch_rows]
+                    
+                    # Document IDs (automatic unless derived from the row)
+                    with metrics.stage("ids"):
+                        doc_ids = [self.make_document_id(row, id_columns, hash_ids) for row in raw_rows]
+                    
+                    index_entries = None
+                    if delta:
+                        # Skip rows whose content matches the previous upload
+                        with metrics.stage("delta"):
+                            index_entries = [(doc_id, self._hash_row(row)) 
+                                             for doc_id, row in zip(doc_ids, raw_rows)]
+                            changed = index.changed(target, index_entries)
+                        raw_rows = [row for row, is_changed in zip(raw_rows, changed) if is_changed]
+                        doc_ids = [doc_id for doc_id, is_changed in zip(doc_ids, changed) if is_changed]
+                    
+                    # Clean data for Firestore, one column at a time
+                    with metrics.stage("clean"):
+                        cleaned_rows = self.clean_firestore_records(raw_rows, converters)
+                    
+                    with metrics.stage("build"):
+                        for doc_id, doc_data in zip(doc_ids, cleaned_rows):
+                            # Add metadata
+                            doc_data['_upload_info'] = {
+                                'uploaded_at': datetime.now(),
+                                'source_file': os.path.basename(file_path),
+                                'collection_path': collection_path
+                            }
+                            
+                            doc_ref = collection_ref.document(doc_id)
+                            writes.append((doc_ref, doc_data))
+                    
+                    written += len(writes)
+                    
+                    if rate_limiter:
+                        with metrics.stage("throttle"):
+                            rate_limiter.acquire(len(writes))
+                    
+                    # Commit batch; blocks while the in-flight window is full
+                    payload = (len(batch_rows), batch_rows[-1][1], index_entries)
+                    with metrics.stage("commit_wait"):
+                        committed_batches = committer.submit(writes, payload)
+                    for committed in committed_batches:
+                        report(committed)
+                
+                # Also runs when cancelled, so every batch sent is journaled
+                with metrics.stage("commit_wait"):
+                    committed_batches = committer.drain()
+                for committed in committed_batches:
+                    report(committed)
+            
+            if cancelled:
+                raise JobCancelled()
+            
+            deleted = 0
+            if delta:
+                deleted = self._delete_stale_rows(index, target, run_id, collection_ref,
+                                                  engine, max_in_flight, batch_size, status_callback,
+                                                  rate_limiter, metrics, job)
+                index.finish(run_id)
+            
+            journal.complete()
+            
             if status_callback:
-                status_callback(f"Successfully completed! {total_rows} records uploaded.")
+                if delta:
+                    status_callback(f"Successfully completed! {uploaded} records checked: "
+                                    f"{written} written, {uploaded - written} unchanged, {deleted} deleted.")
+                else:
+                    status_callback(f"Successfully completed! {uploaded} records uploaded.")
             
             return True
             
+        except JobCancelled:
+            if status_callback:
+                status_callback(f"Cancelled after {uploaded} records. Upload the file again to resume.")
+            return False
+            
         except Exception as e:
             if status_callback:
                 status_callback(f"Error: {str(e)}")
             return False
+        
+        finally:
+            metrics.finish()
+            
+            # Keeps the journal of a failed upload so it can be resumed
+            journal.close()
+            if index:
+                index.close()
+    
+    def _delete_stale_rows(self, index: DeltaIndex, target: str, run_id: int, collection_ref,
+                           engine: str, max_in_flight: int, batch_size: int,
+                           status_callback: Optional[Callable[[str], None]] = None,
+                           rate_limiter: Optional[TokenBucket] = None,
+                           metrics: Optional[UploadMetrics] = None,
+                           job: Optional[Job] = None) -> int:
+        """
+        Delete documents whose rows are no longer in the uploaded file
+        
+        Returns:
+            Number of deleted documents
+        """
+        deleted = 0
+        
+        def forget(doc_ids: List[str]):
+            nonlocal deleted
+            index.remove(target, doc_ids)
+            deleted += len(doc_ids)
+            if status_callback:
+                status_callback(f"Deleting removed records... {deleted}")
+        
+        on_commit = metrics.observe_commit if metrics else None
+        with create_committer(self.db, engine, max_in_flight, batch_size, on_commit) as committer:
+            for doc_ids in index.iter_stale(target, run_id, batch_size):
+                if job:
+                    job.checkpoint()
+                writes = [(collection_ref.document(doc_id), None) for doc_id in doc_ids]
+                if rate_limiter:
+                    rate_limiter.acquire(len(writes))
+                for committed in committer.submit(writes, doc_ids):
+                    forget(committed)
+            
+            for committed in committer.drain():
+                forget(committed)
+        
+        return deleted
     
     def _get_collection_ref(self, collection_path: str):
         """Get collection reference based on path"""
@@ -186,3 +595,135 @@ class CSVProcessor:
         else:
             # Normal collection
             return self.db.collection(collection_path)
+
+
+# Integer literal as produced by CSV exports
+_INT_PATTERN = re.compile(r"[+-]?\d+")
+
+# Column types accepted in schema files; "auto" infers the type per batch
+COLUMN_TYPES = ("auto", "bool", "int", "float", "string")
+
+
+def _infer_column_type(values: "np.ndarray") -> str:
+    """
+    Infer the Firestore type of an array of distinct non-empty CSV strings
+    
+    Returns:
+        One of COLUMN_TYPES; "auto" when there are no values to look at
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if not len(values):
+        return "auto"
+    
+    lowered = np.char.lower(values.astype(str))
+    if ((lowered == "true") | (lowered == "false")).all():
+        return "bool"
+    
+    numbers = pd.to_numeric(values, errors="coerce")
+    if np.isnan(numbers.astype(float)).any():
+        return "string"
+    if numbers.dtype.kind in "iu" or all(_INT_PATTERN.fullmatch(value) for value in values):
+        return "int"
+    return "float"
+
+
+def _parse_values(values: "np.ndarray", column_type: str) -> List[Any]:
+    """
+    Parse distinct non-empty CSV strings as column_type
+    
+    Values that do not parse as the column type are kept as text rather
+    than dropped.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if column_type == "bool":
+        return [{"true": True, "false": False}.get(value.lower(), value) for value in values]
+    
+    if column_type == "int":
+        numbers = pd.to_numeric(values, errors="coerce")
+        if numbers.dtype.kind in "iu":
+            # tolist() turns numpy scalars into plain Python values
+            return numbers.tolist()
+        # Unparseable values or integers beyond 64 bits
+        return [int(value) if _INT_PATTERN.fullmatch(value) else value for value in values]
+    
+    if column_type == "float":
+        numbers = pd.to_numeric(values, errors="coerce").astype(float)
+        return [value if np.isnan(number) else number
+                for value, number in zip(values.tolist(), numbers.tolist())]
+    
+    return values.tolist()
+
+
+def _distinct_values(values: List[Any]) -> "np.ndarray":
+    """Return the distinct non-empty values of a column"""
+    import numpy as np
+    
+    distinct = set(values)
+    distinct.discard(None)
+    distinct.discard("")
+    return np.array(list(distinct), dtype=object)
+
+
+def _map_parsed(values: List[Any], distinct_values: "np.ndarray", column_type: str) -> List[Any]:
+    """Parse every distinct value once, then fill cells from the lookup table"""
+    lookup = dict(zip(distinct_values.tolist(), _parse_values(distinct_values, column_type)))
+    lookup[None] = None
+    lookup[""] = None
+    return [lookup[value] for value in values]
+
+
+def _convert_string(values: List[Any]) -> List[Any]:
+    """Keep a column as text, mapping empty cells to None"""
+    return [value if value != "" else None for value in values]
+
+
+def _convert_column(values: List[Any]) -> List[Any]:
+    """
+    Convert a column of raw CSV values to Python values for Firestore,
+    inferring its type from the values themselves
+    """
+    distinct_values = _distinct_values(values)
+    column_type = _infer_column_type(distinct_values)
+    
+    if column_type == "auto":
+        return [None] * len(values)
+    if column_type == "string":
+        return _convert_string(values)
+    return _map_parsed(values, distinct_values, column_type)
+
+
+def _has_decimals(values: "np.ndarray") -> bool:
+    """Whether any of the distinct CSV strings is a number that is not an integer"""
+    import pandas as pd
+    
+    numbers = pd.to_numeric(values, errors="coerce")
+    if numbers.dtype.kind in "iu":
+        return False
+    return any(number == number and not _INT_PATTERN.fullmatch(value)
+               for value, number in zip(values.tolist(), numbers.astype(float).tolist()))
+
+
+def _build_converter(column_type: str) -> Callable[[List[Any]], List[Any]]:
+    """
+    Create the converter applied to every batch of a column of column_type
+    
+    An int column is widened to float for the rest of the upload as soon
+    as a batch holds a decimal the sample rows did not show.
+    """
+    if column_type == "auto":
+        return _convert_column
+    if column_type == "string":
+        return _convert_string
+    
+    def convert(values: List[Any]) -> List[Any]:
+        nonlocal column_type
+        distinct_values = _distinct_values(values)
+        if column_type == "int" and _has_decimals(distinct_values):
+            column_type = "float"
+        return _map_parsed(values, distinct_values, column_type)
+    
+    return convert
@@ -0,0 +1,141 @@
+"""
+Local row-hash index for delta uploads
+"""
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".firecsv", "delta_index.sqlite3")
+
+
+class DeltaIndex:
+    """
+    Remembers the content hash of every document uploaded to a collection
+    
+    Each upload is a run; rows seen during a run are stamped with its ID, so
+    once the file has been streamed, rows still carrying an older run ID are
+    the ones that disappeared from the CSV and must be deleted.
+    """
+    
+    def __init__(self, index_path: Optional[str] = None):
+        self.index_path = index_path or DEFAULT_INDEX_PATH
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        
+        self.conn = sqlite3.connect(self.index_path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                target TEXT NOT NULL,
+                started_at TEXT NOT NULL,
+                finished INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS rows (
+                target TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                run_id INTEGER NOT NULL,
+                PRIMARY KEY (target, doc_id)
+            ) WITHOUT ROWID;
+        """)
+    
+    def begin(self, target: str, resume: bool = False) -> int:
+        """
+        Start a run for a target collection
+        
+        Args:
+            target: Project-qualified collection path
+            resume: Reuse the last unfinished run so rows committed before
+                an interruption are not treated as removed
+            
+        Returns:
+            Run ID
+        """
+        if resume:
+            row = self.conn.execute(
+                "SELECT run_id FROM runs WHERE target = ? AND finished = 0 "
+                "ORDER BY run_id DESC LIMIT 1", (target,)
+            ).fetchone()
+            if row:
+                return row[0]
+        
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (target, started_at) VALUES (?, ?)",
+                (target, datetime.now().isoformat())
+            )
+        return cursor.lastrowid
+    
+    def changed(self, target: str, entries: Sequence[Tuple[str, str]]) -> List[bool]:
+        """
+        Compare rows against the index
+        
+        Args:
+            target: Project-qualified collection path
+            entries: (document ID, content hash) pairs
+            
+        Returns:
+            For each entry, True if it is new or its content changed
+        """
+        known: Dict[str, str] = {}
+        doc_ids = [doc_id for doc_id, _ in entries]
+        
+        # Stay well below SQLite's bound parameter limit
+        for i in range(0, len(doc_ids), 500):
+            chunk = doc_ids[i:i+500]
+            placeholders = ",".join("?" * len(chunk))
+            known.update(self.conn.execute(
+                f"SELECT doc_id, content_hash FROM rows WHERE target = ? AND doc_id IN ({placeholders})",
+                [target, *chunk]
+            ))
+        
+        return [known.get(doc_id) != content_hash for doc_id, content_hash in entries]
+    
+    def mark(self, target: str, entries: Sequence[Tuple[str, str]], run_id: int):
+        """Record committed rows as seen in this run"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO rows (target, doc_id, content_hash, run_id) VALUES (?, ?, ?, ?)",
+                [(target, doc_id, content_hash, run_id) for doc_id, content_hash in entries]
+            )
+    
+    def iter_stale(self, target: str, run_id: int, page_size: int = 500) -> Iterator[List[str]]:
+        """
+        Stream IDs of rows not seen in this run, a page at a time
+        
+        Args:
+            target: Project-qualified collection path
+            run_id: Current run ID
+            page_size: Number of IDs per page
+            
+        Yields:
+            Lists of document IDs
+        """
+        last_id = ""
+        while True:
+            page = [row[0] for row in self.conn.execute(
+                "SELECT doc_id FROM rows WHERE target = ? AND run_id != ? AND doc_id > ? "
+                "ORDER BY doc_id LIMIT ?", (target, run_id, last_id, page_size)
+            )]
+            if not page:
+                return
+            yield page
+            last_id = page[-1]
+    
+    def remove(self, target: str, doc_ids: Sequence[str]):
+        """Forget rows whose documents were deleted"""
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM rows WHERE target = ? AND doc_id = ?",
+                [(target, doc_id) for doc_id in doc_ids]
+            )
+    
+    def finish(self, run_id: int):
+        """Mark a run as completed"""
+        with self.conn:
+            self.conn.execute("UPDATE runs SET finished = 1 WHERE run_id = ?", (run_id,))
+    
+    def close(self):
+        """Close the index database"""
+        self.conn.close()
@@ -0,0 +1,103 @@
+"""
+Cancellable, pausable background jobs
+"""
+import threading
+from typing import Any, Callable, List, Optional
+
+
+class JobCancelled(Exception):
+    """Raised at a job checkpoint once the job has been cancelled"""
+
+
+class Job:
+    """
+    Control handle of a long-running upload, export or delete
+    
+    The worker calls checkpoint() between batches: it blocks while the job
+    is paused and raises JobCancelled once it is cancelled. Work already
+    handed off (in-flight commits) is left to finish, so a cancelled upload
+    stops on a batch boundary and can be resumed from its checkpoint.
+    """
+    
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.thread: Optional[threading.Thread] = None
+        self._cancelled = threading.Event()
+        self._running = threading.Event()  # Cleared while paused
+        self._running.set()
+        self._done = threading.Event()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+    
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set() and not self.cancelled
+    
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+    
+    def pause(self):
+        """Stop at the next checkpoint until resumed"""
+        self._running.clear()
+    
+    def resume(self):
+        self._running.set()
+    
+    def cancel(self):
+        """Stop at the next checkpoint, waking the job if it is paused"""
+        self._cancelled.set()
+        self._running.set()
+    
+    def checkpoint(self):
+        """Block while paused; raise JobCancelled if the job was cancelled"""
+        self._running.wait()
+        if self._cancelled.is_set():
+            raise JobCancelled(f"{self.name or 'Job'} cancelled")
+    
+    def start(self, target: Callable, *args: Any) -> "Job":
+        """Run target(*args) on a daemon thread"""
+        def run():
+            try:
+                target(*args)
+            finally:
+                self._done.set()
+        
+        self.thread = threading.Thread(target=run, name=f"job-{self.name}", daemon=True)
+        self.thread.start()
+        return self
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the job to finish; returns False on timeout"""
+        return self._done.wait(timeout)
+
+
+class JobManager:
+    """Starts background jobs and keeps track of the ones still running"""
+    
+    def __init__(self):
+        self._jobs: List[Job] = []
+        self._lock = threading.Lock()
+    
+    def start(self, name: str, target: Callable, *args: Any) -> Job:
+        """
+        Start target on a background thread as a job
+        
+        The target is called with the job as its first argument, followed
+        by args, so it can pass the job on to the loops that honor it.
+        """
+        job = Job(name)
+        with self._lock:
+            self._jobs = [running for running in self._jobs if not running.done]
+            self._jobs.append(job)
+        return job.start(target, job, *args)
+    
+    def running(self) -> List[Job]:
+        with self._lock:
+            return [job for job in self._jobs if not job.done]
+    
+    def cancel_all(self):
+        for job in self.running():
+            job.cancel()
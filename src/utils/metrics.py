@@ -0,0 +1,344 @@
+"""
+Upload telemetry: per-stage timings, commit latency histograms and throughput
+
+An UploadMetrics object is filled in by CSVProcessor.upload_csv and
+periodically publishes snapshots to pluggable sinks: an in-memory summary,
+a JSON-lines file or a Prometheus text endpoint.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Upload stages, in pipeline order
+STAGES = ("read", "ids", "delta", "clean", "build", "throttle", "commit_wait", "paused")
+
+# Upper bounds of the commit latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram, as exposed by Prometheus"""
+    
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, value: float):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            index = len(self.buckets)
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Upper bound of the bucket holding the given fraction of observations,
+        or None when there are none or it lies above the largest bucket
+        """
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if self.count and seen >= rank:
+                return bound
+        return None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else f"{bound:g}"] = cumulative
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'p50': self.percentile(0.50),
+            'p90': self.percentile(0.90),
+            'p99': self.percentile(0.99),
+            'buckets': buckets,
+        }
+
+
+class UploadMetrics:
+    """
+    Thread-safe telemetry of one upload
+    
+    Stage timings are wall-clock seconds spent in each step of the upload
+    loop; commit latencies are measured on the commit threads. Snapshots
+    are published to the sinks at most every `interval` seconds and once
+    more when the upload finishes.
+    
+    Args:
+        sinks: Objects with emit(snapshot) and close() methods
+        labels: Labels attached to every snapshot, e.g. file and collection
+        interval: Minimum seconds between published snapshots
+    """
+    
+    def __init__(self, sinks: Optional[List[Any]] = None, labels: Optional[Dict[str, str]] = None,
+                 interval: float = 1.0):
+        self.sinks = list(sinks or [])
+        self.labels = dict(labels or {})
+        self.interval = interval
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+        self.stages: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.commit_latency = Histogram()
+        self.rows = 0
+        self.total_rows = 0
+        self.bytes = 0
+        self.writes = 0
+        self._published = 0.0
+        self._lock = threading.Lock()
+    
+    def timed_iter(self, iterable: Iterable[Any], name: str) -> Iterator[Any]:
+        """Yield from an iterable, timing each step as part of a stage"""
+        iterator = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.add_stage(name, time.perf_counter() - started)
+            yield item
+    
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as part of a stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - started)
+    
+    def add_stage(self, name: str, seconds: float):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+    
+    def observe_commit(self, seconds: float, writes: int):
+        """Record one batch commit (or BulkWriter flush) and its write count"""
+        with self._lock:
+            self.commit_latency.observe(seconds)
+            self.writes += writes
+    
+    def progress(self, rows: int, total_rows: int, bytes_read: int):
+        """Record the rows committed and CSV bytes consumed so far"""
+        with self._lock:
+            self.rows, self.total_rows, self.bytes = rows, total_rows, bytes_read
+        
+        now = time.monotonic()
+        if now - self._published >= self.interval:
+            self._published = now
+            self.publish()
+    
+    def finish(self):
+        """Stop the clock and publish the final snapshot"""
+        self.finished = time.monotonic()
+        self.publish()
+    
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+    
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed()
+        return self.rows / elapsed if elapsed > 0 else 0.0
+    
+    def bytes_per_second(self) -> float:
+        elapsed = self.elapsed()
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+    
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until all rows are committed, or None if unknown"""
+        rate = self.rows_per_second()
+        if not rate or self.total_rows <= self.rows:
+            return None
+        return (self.total_rows - self.rows) / rate
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Current metrics as a JSON-serializable dictionary"""
+        with self._lock:
+            elapsed = self.elapsed()
+            return {
+                'time': time.time(),
+                'labels': dict(self.labels),
+                'finished': self.finished is not None,
+                'elapsed': round(elapsed, 3),
+                'rows': self.rows,
+                'total_rows': self.total_rows,
+                'bytes': self.bytes,
+                'writes': self.writes,
+                'rows_per_second': round(self.rows / elapsed, 1) if elapsed > 0 else 0.0,
+                'bytes_per_second': round(self.bytes / elapsed, 1) if elapsed > 0 else 0.0,
+                'stages': {name: round(seconds, 6) for name, seconds in self.stages.items()},
+                'commit_latency': self.commit_latency.to_dict(),
+            }
+    
+    def publish(self):
+        if not self.sinks:
+            return
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink.emit(snapshot)
+    
+    def summary(self) -> str:
+        """One-line human-readable summary"""
+        snapshot = self.snapshot()
+        stages = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in snapshot['stages'].items()
+                           if seconds >= 0.05)
+        latency = snapshot['commit_latency']
+        text = (f"{snapshot['rows']} rows in {snapshot['elapsed']:.1f}s "
+                f"({snapshot['rows_per_second']:,.0f} rows/s, "
+                f"{snapshot['bytes_per_second'] / 1024 / 1024:,.1f} MB/s)")
+        if latency['count']:
+            text += f"; commit p50 {_format_bound(latency['p50'])}, p99 {_format_bound(latency['p99'])}"
+        if stages:
+            text += f"; {stages}"
+        return text
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """Format an ETA as H:MM:SS, or "--" when unknown"""
+    if seconds is None:
+        return "--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class MemorySink:
+    """Keeps the latest snapshot of each upload in memory"""
+    
+    def __init__(self):
+        self.snapshots: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def emit(self, snapshot: Dict[str, Any]):
+        with self._lock:
+            self.snapshots[_label_key(snapshot['labels'])] = snapshot
+    
+    def latest(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.snapshots.values())
+    
+    def close(self):
+        pass
+
+
+class JsonLinesSink:
+    """Appends every snapshot to a JSON-lines file"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+    
+    def emit(self, snapshot: Dict[str, Any]):
+        line = json.dumps(snapshot)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+    
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class PrometheusSink(MemorySink):
+    """
+    Serves the latest snapshots in Prometheus text format
+    
+    Metrics are available at http://host:port/metrics while the sink is
+    open; the server runs on a daemon thread.
+    """
+    
+    def __init__(self, port: int = 9464, host: str = "127.0.0.1"):
+        # Imported here; http.server is slow to import and rarely needed
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        super().__init__()
+        sink = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = sink.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+    
+    def render(self) -> str:
+        """Render the latest snapshots in Prometheus text exposition format"""
+        lines = []
+        
+        def metric(name: str, metric_type: str, help_text: str, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                lines.append(f"{name}{_prometheus_labels(labels)} {value}")
+        
+        snapshots = self.latest()
+        metric("firecsv_upload_rows_total", "counter", "Rows committed",
+               [(s['labels'], s['rows']) for s in snapshots])
+        metric("firecsv_upload_bytes_total", "counter", "CSV bytes consumed",
+               [(s['labels'], s['bytes']) for s in snapshots])
+        metric("firecsv_upload_rows_per_second", "gauge", "Average rows committed per second",
+               [(s['labels'], s['rows_per_second']) for s in snapshots])
+        metric("firecsv_upload_stage_seconds_total", "counter", "Seconds spent in each upload stage",
+               [(dict(s['labels'], stage=stage), seconds)
+                for s in snapshots for stage, seconds in s['stages'].items()])
+        
+        latency = "firecsv_commit_latency_seconds"
+        lines.append(f"# HELP {latency} Batch commit latency")
+        lines.append(f"# TYPE {latency} histogram")
+        for s in snapshots:
+            histogram = s['commit_latency']
+            for bound, count in histogram['buckets'].items():
+                lines.append(f"{latency}_bucket{_prometheus_labels(dict(s['labels'], le=bound))} {count}")
+            lines.append(f"{latency}_sum{_prometheus_labels(s['labels'])} {histogram['sum']}")
+            lines.append(f"{latency}_count{_prometheus_labels(s['labels'])} {histogram['count']}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _format_bound(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return f"> {LATENCY_BUCKETS[-1]:g} s"
+    return f"<= {seconds * 1000:g} ms"
+
+
+def _label_key(labels: Dict[str, str]) -> str:
+    return json.dumps(labels, sort_keys=True)
+
+
+def _prometheus_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
@@ -0,0 +1,43 @@
+"""
+Write rate limiting shared between concurrent uploads
+"""
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+    
+    Tokens refill at `rate` per second up to `burst`. A request larger than
+    the bucket is let through once the bucket is full and leaves it in
+    debt, so the long-run rate is kept for any batch size.
+    """
+    
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.capacity = burst or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: float = 1):
+        """Block until `tokens` writes may proceed"""
+        needed = min(tokens, self.capacity)
+        
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                
+                if self._tokens >= needed:
+                    self._tokens -= tokens
+                    return
+                
+                delay = (needed - self._tokens) / self.rate
+            
+            time.sleep(delay)
@@ -0,0 +1,175 @@
+"""
+Queue of CSV uploads run concurrently under a shared write-rate budget
+"""
+import glob
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, List, Optional
+
+from utils.jobs import Job
+from utils.metrics import UploadMetrics
+from utils.rate_limiter import TokenBucket
+
+
+def expand_sources(sources: List[str]) -> List[str]:
+    """
+    Expand files, directories and glob patterns into CSV file paths
+    
+    Directories contribute the .csv files directly inside them. Duplicates
+    are dropped and the order of the sources is kept.
+    
+    Args:
+        sources: File paths, directory paths or glob patterns
+    
+    Returns:
+        List of CSV file paths
+    """
+    files = []
+    for source in sources:
+        if os.path.isdir(source):
+            matches = sorted(glob.glob(os.path.join(glob.escape(source), "*.csv")))
+        elif glob.has_magic(source):
+            matches = sorted(path for path in glob.glob(source) if os.path.isfile(path))
+        else:
+            matches = [source]
+        
+        for path in matches:
+            if path not in files:
+                files.append(path)
+    return files
+
+
+def target_collection_path(file_path: str, collection: str, sub_collection: str = "",
+                           mode: str = "manual") -> str:
+    """
+    Map a CSV file to its target collection path
+    
+    Follows the sub-collection modes of the upload tab: "filename" uses the
+    file name without extension, "manual" and "date" use sub_collection
+    as given (in "date" mode it already carries the date).
+    
+    Args:
+        file_path: CSV file path
+        collection: Main collection name
+        sub_collection: Sub-collection entered by the user
+        mode: "manual", "filename" or "date"
+    
+    Returns:
+        Collection path, e.g. main_collection/sub_collection
+    """
+    if mode == "filename":
+        sub_collection = os.path.splitext(os.path.basename(file_path))[0]
+    elif mode == "date" and not sub_collection:
+        sub_collection = datetime.now().strftime("%Y%m%d")
+    
+    if sub_collection:
+        return f"{collection}/{sub_collection}"
+    return collection
+
+
+class UploadJob:
+    """A CSV file queued for upload"""
+    
+    def __init__(self, file_path: str, collection_path: str):
+        self.file_path = file_path
+        self.collection_path = collection_path
+        self.status = "Queued"
+        self.uploaded = 0
+        self.total = 0
+        self.success: Optional[bool] = None
+        self.metrics: Optional[UploadMetrics] = None
+
+
+class UploadQueue:
+    """
+    Runs queued CSV uploads concurrently
+    
+    All jobs share one token bucket, so max_writes_per_second caps the
+    combined write rate no matter how many uploads run at once.
+    """
+    
+    def __init__(self, csv_processor, max_jobs: int = 2,
+                 max_writes_per_second: Optional[float] = None):
+        self.csv_processor = csv_processor
+        self.max_jobs = max(1, max_jobs)
+        self.rate_limiter = TokenBucket(max_writes_per_second) if max_writes_per_second else None
+        self.jobs: List[UploadJob] = []
+        self._lock = threading.Lock()
+    
+    def add(self, file_path: str, collection_path: str) -> UploadJob:
+        """Queue a CSV file for upload to a collection path"""
+        job = UploadJob(file_path, collection_path)
+        with self._lock:
+            self.jobs.append(job)
+        return job
+    
+    def run(self, job_callback: Optional[Callable[[UploadJob], None]] = None,
+            resume: bool = True, metrics_sinks: Optional[List[Any]] = None,
+            job: Optional[Job] = None, **upload_kwargs: Any) -> List[UploadJob]:
+        """
+        Upload every queued job and wait for all of them
+        
+        By default interrupted uploads of the same file and collection are
+        resumed from their checkpoint, so a failed queue can simply be run
+        again.
+        
+        Args:
+            job_callback: Called from worker threads whenever a job's status changes
+            resume: Resume interrupted uploads from their checkpoint
+            metrics_sinks: Sinks receiving every job's metrics, labelled by file
+                and collection
+            job: Pauses or cancels every upload of the queue; files not started
+                yet are skipped once it is cancelled
+            **upload_kwargs: Passed to CSVProcessor.upload_csv (batch_size, engine, ...)
+        
+        Returns:
+            The jobs, with their final status
+        """
+        with self._lock:
+            queued = [upload_job for upload_job in self.jobs if upload_job.success is None]
+        
+        def upload(upload_job: UploadJob):
+            def progress_callback(current: int, total: int):
+                upload_job.uploaded, upload_job.total = current, total
+                if job_callback:
+                    job_callback(upload_job)
+            
+            def status_callback(status: str):
+                upload_job.status = status
+                if job_callback:
+                    job_callback(upload_job)
+            
+            if job and job.cancelled:
+                # Left queued, so running the queue again uploads it
+                status_callback("Cancelled")
+                return
+            
+            upload_job.metrics = UploadMetrics(metrics_sinks, labels={
+                'file': os.path.basename(upload_job.file_path),
+                'collection': upload_job.collection_path
+            })
+            status_callback("Starting...")
+            success = self.csv_processor.upload_csv(
+                upload_job.file_path,
+                upload_job.collection_path,
+                progress_callback=progress_callback,
+                status_callback=status_callback,
+                resume=resume,
+                rate_limiter=self.rate_limiter,
+                metrics=upload_job.metrics,
+                job=job,
+                **upload_kwargs
+            )
+            # A cancelled upload stays queued and is resumed on the next run
+            if success or not (job and job.cancelled):
+                upload_job.success = success
+            if job_callback:
+                job_callback(upload_job)
+        
+        with ThreadPoolExecutor(max_workers=self.max_jobs, thread_name_prefix="upload-job") as executor:
+            for future in [executor.submit(upload, upload_job) for upload_job in queued]:
+                future.result()
+        
+        return queued
@@ -0,0 +1,69 @@
+"""
+Tests of export range splitting against the in-process fake Firestore client
+"""
+import os
+import sys
+from itertools import islice
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from fake_firestore import FakeClient
+from firebase.collection_manager import CollectionManager
+
+
+def _manager(collections):
+    client = FakeClient()
+    for path, count in collections.items():
+        batch = client.batch()
+        for index in range(count):
+            batch.set(client.collection(*path.split("/")).document(f"d{index:03d}"), {"n": index})
+        batch.commit()
+    return CollectionManager(client)
+
+
+def _no_offset_scan(collection_path, partitions):
+    raise AssertionError("offset scan used although the partition query had enough split points")
+
+
+def test_split_ids_come_from_partition_query():
+    manager = _manager({"orders": 100})
+    manager._offset_split_ids = _no_offset_scan
+    assert manager._partition_split_ids("orders", 4) == ["d025", "d050", "d075"]
+
+
+def test_partition_points_of_other_collections_with_same_id_are_dropped():
+    manager = _manager({"a/x/data": 300, "b/y/data": 10})
+    manager._offset_split_ids = _no_offset_scan
+    assert manager._partition_split_ids("a/x/data", 3) == ["d104", "d208"]
+
+
+def test_too_few_partition_points_fall_back_to_offset_scan():
+    manager = _manager({"a/x/data": 300, "b/y/data": 10})
+    assert manager._partition_split_ids("b/y/data", 3) == ["d004", "d008"]
+
+
+def test_empty_export_leaves_no_header_only_file(tmp_path):
+    manager = _manager({})
+    output_file = tmp_path / "empty.csv"
+    assert manager.export_collection("orders", str(output_file), columns=["n"]) is False
+    assert manager.export_collection("orders", str(output_file), header_mode="sample") is False
+    assert not output_file.exists()
+
+
+def test_export_error_is_raised_and_partial_file_removed(tmp_path):
+    manager = _manager({"orders": 10})
+    documents = manager.iter_documents
+    
+    def failing_documents(*args, **kwargs):
+        yield from islice(documents(*args, **kwargs), 5)
+        raise RuntimeError("deadline exceeded")
+    
+    manager.iter_documents = failing_documents
+    output_file = tmp_path / "orders.csv"
+    with pytest.raises(RuntimeError, match="deadline exceeded"):
+        manager.export_collection("orders", str(output_file), header_mode="sample", sample_size=2)
+    assert not output_file.exists()
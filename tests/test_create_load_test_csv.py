@@ -0,0 +1,46 @@
+"""
+Tests of the synthetic load test CSV generator
+"""
+import csv
+import io
+import os
+import sys
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from create_load_test_csv import default_schema, generate_chunk, _vocabularies
+
+
+def _chunk(columns, seed=1, chunk_index=0, count=2000):
+    return generate_chunk(columns, _vocabularies(columns, seed), seed, 0, chunk_index, count, 0)
+
+
+def test_chunk_is_valid_csv_of_typed_values():
+    columns = default_schema(13, null_ratio=0.1, string_width=(0, 6))
+    rows = list(csv.reader(io.StringIO(_chunk(columns).decode("utf-8"))))
+    
+    assert len(rows) == 2000
+    assert all(len(row) == len(columns) for row in rows)
+    assert [row[0] for row in rows] == [str(index) for index in range(2000)]
+    
+    for row in rows:
+        for column, value in zip(columns, row):
+            if not value:
+                continue
+            if column["type"] == "int":
+                int(value)
+            elif column["type"] == "float":
+                float(value)
+            elif column["type"] == "bool":
+                assert value in ("True", "False")
+            elif column["type"] == "date":
+                date.fromisoformat(value)
+            elif column["type"] == "timestamp":
+                datetime.fromisoformat(value)
+
+
+def test_chunks_are_reproducible():
+    columns = default_schema(8, null_ratio=0.2, key_cardinality=50)
+    assert _chunk(columns) == _chunk(columns)
+    assert _chunk(columns) != _chunk(columns, chunk_index=1)
@@ -0,0 +1,42 @@
+"""
+Tests of the CSV column type inference and batch conversion
+"""
+import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from utils.csv_processor import CSVProcessor, _build_converter
+
+
+def test_int_converter_widens_to_float_on_decimal():
+    assert _build_converter("int")(["1", "2", "2.5"]) == [1.0, 2.0, 2.5]
+
+
+def test_int_converter_keeps_non_numbers_as_text():
+    assert _build_converter("int")(["1", "n/a", ""]) == [1, "n/a", None]
+
+
+def test_decimal_after_sample_window_is_stored_as_float(tmp_path):
+    file_path = tmp_path / "amounts.csv"
+    with open(file_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["amount"])
+        writer.writerows([[index] for index in range(1500)])
+        writer.writerow(["2.5"])
+        writer.writerows([[index] for index in range(1500, 1600)])
+    
+    processor = CSVProcessor(None)
+    schema = processor.infer_schema(str(file_path), sample_rows=1000)
+    assert schema == {"amount": "int"}
+    
+    convert = processor.build_converters(schema)["amount"]
+    rows = [row["amount"] for row, _ in processor.iter_csv(str(file_path))]
+    batches = [convert(rows[start:start + 500]) for start in range(0, len(rows), 500)]
+    values = [value for batch in batches for value in batch]
+    
+    assert values[:1500] == list(range(1500))
+    assert values[1500] == 2.5
+    assert all(isinstance(value, float) for value in values[1500:])
+    assert not any(isinstance(value, str) for value in values)